@@ -0,0 +1,130 @@
+"""
+Shared helpers for the benchmark scripts in this folder.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_FILE = ROOT / "png_sequence_renamer_gui_v1.0.0.py"
+sys.path.insert(0, str(ROOT))
+
+
+def load_renamer():
+    """Import the png_sequence_renamer package from this checkout."""
+    import png_sequence_renamer
+    return png_sequence_renamer
+
+
+def bench_dir():
+    """Return a scratch directory, preferring tmpfs so disk speed does not dominate."""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    return tempfile.mkdtemp(prefix="png_renamer_bench_", dir=base)
+
+
+def make_sequence(folder, count, basename="shot_v003.", padding=7, extra=0):
+    """Create ``count`` empty PNG frames plus ``extra`` non-PNG files in folder."""
+    for i in range(count):
+        open(os.path.join(folder, f"{basename}{str(i + 1).zfill(padding)}.png"), 'wb').close()
+    for i in range(extra):
+        open(os.path.join(folder, f"notes_{i}.txt"), 'wb').close()
+
+
+# Naming styles of make_messy_sequence: (weight, template) with {n} the frame number
+MESSY_STYLES = (
+    (70, "Shot010_v003.{n:04d}.png"),
+    (10, "shot010_v003.{n}.png"),
+    (8, "Shot010 v003 ({n}).PNG"),
+    (7, "render-{n:06d}_final.png"),
+    (5, "comp_{n:07d}.Png"),
+)
+
+
+def make_messy_sequence(folder, count, seed=0):
+    """Create ``count`` empty PNG files named like a real render folder, plus a few non-PNG files.
+
+    Every frame number gets one of the MESSY_STYLES naming styles (mixed
+    padding, case, spaces and extensions), picked at random from seed, and
+    one non-PNG file (.exr, .txt) is added per 50 frames.
+    """
+    import random
+    rng = random.Random(seed)
+    weights = [weight for weight, _ in MESSY_STYLES]
+    templates = rng.choices([template for _, template in MESSY_STYLES], weights, k=count)
+    for n, template in enumerate(templates, 1):
+        open(os.path.join(folder, template.format(n=n)), 'wb').close()
+    for i in range(count // 50):
+        extension = ".exr" if i % 2 else ".txt"
+        open(os.path.join(folder, f"Shot010_v003.{i:04d}{extension}"), 'wb').close()
+
+
+class CallCounter:
+    """Count filesystem calls made through os while active.
+
+    Wraps the os functions pathlib uses (listdir, stat, lstat), os.scandir and
+    the first, uncached DirEntry.stat call per entry. DirEntry.is_file is
+    answered from the directory listing on Linux, macOS and Windows and
+    therefore costs no extra call.
+    """
+    
+    def __init__(self):
+        self.calls = 0
+        self._saved = {}
+    
+    def __enter__(self):
+        counter = self
+        
+        def wrap(func):
+            def wrapper(*args, **kwargs):
+                counter.calls += 1
+                return func(*args, **kwargs)
+            return wrapper
+        
+        class CountingEntry:
+            """DirEntry proxy that counts the first (uncached) stat call."""
+            
+            def __init__(self, entry):
+                self._entry = entry
+                self._stat_done = False
+            
+            def stat(self, **kwargs):
+                if not self._stat_done:
+                    counter.calls += 1
+                    self._stat_done = True
+                return self._entry.stat(**kwargs)
+            
+            def __getattr__(self, name):
+                return getattr(self._entry, name)
+        
+        class CountingScandir:
+            def __init__(self, path):
+                self._it = self._saved_scandir(path)
+            
+            def __enter__(self):
+                return self
+            
+            def __exit__(self, *exc):
+                self._it.close()
+            
+            def __iter__(self):
+                return (CountingEntry(entry) for entry in self._it)
+        
+        CountingScandir._saved_scandir = staticmethod(os.scandir)
+        
+        for name in ('stat', 'lstat', 'listdir'):
+            self._saved[name] = getattr(os, name)
+            setattr(os, name, wrap(self._saved[name]))
+        self._saved['scandir'] = os.scandir
+        
+        def counting_scandir(path='.'):
+            counter.calls += 1
+            return CountingScandir(path)
+        
+        os.scandir = counting_scandir
+        return self
+    
+    def __exit__(self, *exc):
+        for name, func in self._saved.items():
+            setattr(os, name, func)
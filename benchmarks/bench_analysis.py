@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Time the gap/duplicate analysis on synthetic sequences (no files are created).
+
+Cases over a range of `span` frames, grouped from names in sort order unless
+noted: complete, every 1000th frame missing, the same shuffled (one run per
+file instead of one per gap), and a sequence whose frames 1-1000 also exist
+with a different padding (duplicates).
+
+Usage: python benchmarks/bench_analysis.py [span]
+"""
+
+import gc
+import random
+import sys
+import time
+
+from _common import load_renamer
+
+renamer = load_renamer()
+from png_sequence_renamer.analysis import analyze_sequence  # noqa: E402
+
+
+def sequence(names):
+    sequences, _ = renamer.group_sequences(names)
+    return sequences[0]
+
+
+def run(label, seq):
+    # Collect the name strings now so a full collection does not land in the timing
+    gc.collect()
+    start = time.perf_counter()
+    result = analyze_sequence(seq)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<24} {result['files']:>9} files  {len(result['missing']):>6} gaps  "
+          f"{len(result['duplicates']):>5} duplicates  {elapsed * 1000:8.1f} ms")
+
+
+def main():
+    span = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+    print(f"frame range {span}")
+    run("complete", sequence(f"shot.{f:08d}.png" for f in range(1, span + 1)))
+    names = [f"shot.{f:08d}.png" for f in range(1, span + 1) if f % 1000]
+    run("every 1000th missing", sequence(names))
+    random.Random(0).shuffle(names)
+    run("  shuffled", sequence(names))
+    del names
+    run("1000 duplicate frames", sequence(
+        [f"shot.{f:08d}.png" for f in range(1, span + 1)] + [f"shot.{f}.png" for f in range(1, 1001)]))
+
+
+if __name__ == "__main__":
+    main()
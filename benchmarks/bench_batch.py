@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Batch mode throughput: rename a tree of shot folders with 1..N worker processes.
+
+Each run builds `folders` folders of `files` frames under a fresh root, then
+times run_batch (discovery included).
+
+Usage: python benchmarks/bench_batch.py [folders] [files] [workers ...]
+"""
+
+import os
+import shutil
+import sys
+import time
+
+from _common import bench_dir, load_renamer, make_sequence
+
+renamer = load_renamer()
+from png_sequence_renamer.batch import run_batch  # noqa: E402
+
+OPTIONS = {'basename': "frame", 'start': 1, 'padding': 0, 'prefix': "", 'suffix': "",
+           'sort': "Name", 'split': False, 'compact_log': False, 'dry_run': False}
+
+
+def run(folders, files, workers):
+    root = bench_dir()
+    try:
+        for i in range(folders):
+            folder = os.path.join(root, f"seq{i % 10:02d}", f"sh{i:04d}")
+            os.makedirs(folder)
+            make_sequence(folder, files)
+        start = time.perf_counter()
+        summary = run_batch(root, OPTIONS, workers=workers)
+        elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(root)
+    assert summary['counts'] == {'renamed': folders}, summary['counts']
+    print(f"  {workers:>3} workers  {elapsed:7.2f} s   {folders / elapsed:7.1f} folders/s   "
+          f"{summary['files'] / elapsed:9.0f} files/s")
+
+
+def main():
+    folders = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    files = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    cpus = os.cpu_count() or 1
+    workers = [int(arg) for arg in sys.argv[3:]] or sorted({1, max(1, cpus // 2), cpus, 2 * cpus})
+    print(f"{folders} folders x {files} files, {cpus} CPUs")
+    for count in workers:
+        run(folders, files, count)
+
+
+if __name__ == "__main__":
+    main()
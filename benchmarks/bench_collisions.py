@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Count filesystem calls made by the preview pipeline (scan, plan, collision check).
+
+Compares detect_collisions stat'ing every target with checking against the
+listing collected during the scan. The set-based check should add no calls.
+
+Usage: python benchmarks/bench_collisions.py [file_count]
+"""
+
+import shutil
+import sys
+import time
+
+from _common import CallCounter, bench_dir, load_renamer, make_sequence
+
+renamer = load_renamer()
+
+
+def preview(folder, use_listing):
+    listing = set() if use_listing else None
+    entries = renamer.scan_folder(folder, "Name", listing=listing)
+    renames = renamer.plan_renames([entry.name for entry in entries], "frame", 1, 0, "", "")
+    return renamer.detect_collisions(renames, folder, existing_names=listing)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    folder = bench_dir()
+    try:
+        make_sequence(folder, count, extra=count // 100)
+        for label, use_listing in (("stat", False), ("listing", True)):
+            start = time.perf_counter()
+            preview(folder, use_listing)
+            elapsed = time.perf_counter() - start
+            with CallCounter() as counter:
+                preview(folder, use_listing)
+            print(f"  {label:<8} {elapsed * 1000:9.1f} ms   {counter.calls:>8} filesystem calls")
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Reopen a folder through the persistent index versus scanning it again.
+
+Counts filesystem calls (see _common.CallCounter) and wall time for: a plain
+scan_folder, the first cached_scan (which writes the index), a reopen of the
+unchanged folder, and a reopen after 1% more frames of the sequence were
+rendered. Each in
+"Name" and "Modified" order. The index is written to a scratch cache folder.
+
+Usage: python benchmarks/bench_index.py [file_count]
+"""
+
+import os
+import shutil
+import sys
+import time
+
+from _common import CallCounter, bench_dir, load_renamer, make_sequence
+
+renamer = load_renamer()
+from png_sequence_renamer import index_cache  # noqa: E402
+
+# The folder was created a moment ago, inside the window where its mtime is
+# not trusted; the benchmark wants the steady state of an older folder
+index_cache.RACY_WINDOW_NS = 0
+
+
+def measure(label, func):
+    with CallCounter() as counter:
+        start = time.perf_counter()
+        entries = func()
+        elapsed = time.perf_counter() - start
+    print(f"    {label:<22} {elapsed * 1000:9.1f} ms   {counter.calls:>8} fs calls   {len(entries)} files")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    for sort_mode in ("Name", "Modified"):
+        folder = bench_dir()
+        cache_dir = bench_dir()
+        try:
+            make_sequence(folder, count)
+            print(f"{count} files, sort by {sort_mode}")
+            measure("scan_folder", lambda: renamer.scan_folder(folder, sort_mode))
+            measure("cached_scan, no index", lambda: index_cache.cached_scan(folder, sort_mode, cache_dir=cache_dir))
+            measure("cached_scan, unchanged", lambda: index_cache.cached_scan(folder, sort_mode, cache_dir=cache_dir))
+            for i in range(count, count + count // 100):
+                open(os.path.join(folder, f"shot_v003.{i + 1:07d}.png"), 'wb').close()
+            measure("cached_scan, +1% files", lambda: index_cache.cached_scan(folder, sort_mode, cache_dir=cache_dir))
+        finally:
+            shutil.rmtree(folder)
+            shutil.rmtree(cache_dir)
+
+
+if __name__ == "__main__":
+    main()
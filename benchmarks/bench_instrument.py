@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Cost of the pipeline instrumentation, off and on.
+
+Times scan -> plan -> collision check of a folder with recording off and on
+(best of several runs each), then the per-call cost that timed() and count()
+add to a function that does nothing.
+
+Usage: python benchmarks/bench_instrument.py [file_count]
+"""
+
+import shutil
+import sys
+import timeit
+
+from _common import bench_dir, load_renamer, make_sequence
+
+renamer = load_renamer()
+from png_sequence_renamer.instrument import count, recording, timed  # noqa: E402
+
+RUNS = 7
+
+
+def pipeline(folder):
+    listing = set()
+    entries = renamer.scan_folder(folder, "Name", listing=listing)
+    renames = renamer.plan_renames([entry.path for entry in entries], "frame", 1, 0, "", "")
+    renamer.detect_collisions(renames, folder, existing_names=listing)
+
+
+def best(func):
+    return min(timeit.repeat(func, number=1, repeat=RUNS))
+
+
+def main():
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    folder = bench_dir()
+    try:
+        make_sequence(folder, file_count)
+        off = best(lambda: pipeline(folder))
+        with recording() as recorder:
+            on = best(lambda: pipeline(folder))
+        print(f"scan/plan/collisions of {file_count} files")
+        print(f"  recording off  {off * 1000:8.1f} ms")
+        print(f"  recording on   {on * 1000:8.1f} ms   ({(on / off - 1) * 100:+.1f}%)")
+        print(f"  phases: {', '.join(recorder.report()['phases'])}")
+    finally:
+        shutil.rmtree(folder)
+    
+    def bare():
+        pass
+    
+    wrapped = timed('bench')(bare)
+    loops = 1000000
+    base = min(timeit.repeat(bare, number=loops, repeat=3))
+    print(f"per call, {loops} calls")
+    for label, func in (("timed(), off", wrapped), ("count(), off", lambda: count('bench'))):
+        cost = min(timeit.repeat(func, number=loops, repeat=3))
+        print(f"  {label:<14} {(cost - base) / loops * 1e9:6.0f} ns over a bare call")
+    with recording():
+        for label, func in (("timed(), on", wrapped), ("count(), on", lambda: count('bench'))):
+            cost = min(timeit.repeat(func, number=loops, repeat=3))
+            print(f"  {label:<14} {(cost - base) / loops * 1e9:6.0f} ns over a bare call")
+
+
+if __name__ == "__main__":
+    main()
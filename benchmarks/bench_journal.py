@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Measure the cost of the write-ahead rename journal.
+
+Shifts a sequence by one frame with two_phase_rename, with and without a
+journal, and reports renames per second and fsync calls. fsync is nearly free
+on tmpfs, so pass a directory on a real disk to see the group-commit effect.
+
+Usage: python benchmarks/bench_journal.py [file_count] [directory]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from _common import bench_dir, load_renamer, make_sequence
+
+renamer = load_renamer()
+
+
+def run(count, base, journaled):
+    folder = tempfile.mkdtemp(prefix="png_renamer_bench_", dir=base) if base else bench_dir()
+    try:
+        make_sequence(folder, count, basename="f_")
+        renames = [(path, f"f_{i + 2:07d}.png")
+                   for i, path in enumerate(renamer.get_png_files(folder, "Name"))]
+        journal_path = renamer.journal_path_for(folder) if journaled else None
+        
+        fsyncs = [0]
+        saved = os.fsync
+        
+        def counting_fsync(fd):
+            fsyncs[0] += 1
+            return saved(fd)
+        
+        os.fsync = counting_fsync
+        try:
+            start = time.perf_counter()
+            renamer.two_phase_rename(renames, folder, journal_path=journal_path)
+            elapsed = time.perf_counter() - start
+        finally:
+            os.fsync = saved
+        return elapsed, fsyncs[0]
+    finally:
+        shutil.rmtree(folder)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    base = sys.argv[2] if len(sys.argv) > 2 else None
+    print(f"shift by one, {count} files in {base or 'tmpfs'}")
+    for label, journaled in (("no journal", False), ("journal", True)):
+        elapsed, fsyncs = run(count, base, journaled)
+        print(f"  {label:<10} {elapsed * 1000:9.1f} ms   {count / elapsed:9.0f} renames/sec   {fsyncs:>5} fsyncs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Compare the CSV rename log with the compact log: file size, write time and the
+time to read every pair back with iter_log (the parsing part of undo).
+
+The pairs are synthetic renumbering jobs, so no files are created.
+
+Usage: python benchmarks/bench_log.py [file_count ...]
+"""
+
+import os
+import shutil
+import sys
+import time
+
+from _common import bench_dir, load_renamer
+
+renamer = load_renamer()
+
+
+def measure(writer, pairs, log_path):
+    start = time.perf_counter()
+    writer(pairs, log_path)
+    write_time = time.perf_counter() - start
+    start = time.perf_counter()
+    count = sum(1 for _ in renamer.iter_log(log_path))
+    read_time = time.perf_counter() - start
+    assert count == len(pairs)
+    return os.path.getsize(log_path), write_time, read_time
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [100000, 1000000]
+    folder = bench_dir()
+    try:
+        for count in counts:
+            base = os.path.join(folder, "renders", "shot010")
+            pairs = [(os.path.join(base, f"shot_v003.{i + 1:07d}.png"), os.path.join(base, f"frame_{i + 1001:07d}.png"))
+                     for i in range(count)]
+            print(f"{count} renames")
+            for label, writer in (("csv", renamer.write_log), ("compact", renamer.write_compact_log)):
+                size, write_time, read_time = measure(writer, pairs, os.path.join(folder, f"log.{label}"))
+                print(f"  {label:<8} {size / 1e6:10.3f} MB   write {write_time:6.2f} s   read {read_time:6.2f} s")
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    main()
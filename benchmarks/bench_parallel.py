@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Measure parallel_rename throughput against simulated network latency.
+
+Every DirRenamer.rename call is delayed by a fixed round-trip time to mimic an
+SMB/NFS share, then a shift-by-one job (a single long dependency chain) is run
+with increasing worker counts.
+
+Usage: python benchmarks/bench_parallel.py [file_count] [latency_ms]
+"""
+
+import shutil
+import sys
+import time
+
+from _common import bench_dir, load_renamer, make_sequence
+
+renamer = load_renamer()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 2.0) / 1000
+
+    real_rename = renamer.DirRenamer.rename
+
+    def slow_rename(self, src_name, dst_name):
+        time.sleep(latency)
+        return real_rename(self, src_name, dst_name)
+
+    renamer.DirRenamer.rename = slow_rename
+    print(f"shift by one, {count} files, {latency * 1000:.1f} ms per rename")
+    for workers in (1, 2, 4, 8, 16, 32):
+        folder = bench_dir()
+        try:
+            make_sequence(folder, count, basename="f_")
+            files = renamer.get_png_files(folder, "Name")
+            renames = [(path, f"f_{i + 2:07d}.png") for i, path in enumerate(files)]
+            stats = {}
+            renamer.parallel_rename(renames, folder, workers=workers, stats=stats)
+            print(f"  {workers:>3} workers  {stats['renames']:>7} renames  "
+                  f"{stats['seconds']:7.2f} s  {stats['renames_per_sec']:9.0f} renames/sec")
+        finally:
+            shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    main()
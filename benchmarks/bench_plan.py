@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Compare memory and time of a RenamePlan with the old list of (old_path,
+new_name) tuples, including a preview-style random access pass.
+
+No files are created; the sources are plain name strings, so the numbers are
+a lower bound for plans built from Path objects.
+
+Usage: python benchmarks/bench_plan.py [file_count]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+from _common import load_renamer
+
+renamer = load_renamer()
+
+
+def tuple_plan(sources, basename, start_index, zero_padding, prefix, suffix):
+    """The old plan_renames: one tuple and one new name string per file."""
+    zero_padding = renamer.resolve_padding(zero_padding, start_index, len(sources))
+    return [(old_path, renamer.format_target_name(basename, start_index + i, zero_padding, prefix, suffix))
+            for i, old_path in enumerate(sources)]
+
+
+def measure(label, build, sources):
+    tracemalloc.start()
+    start = time.perf_counter()
+    plan = build(sources, "frame", 1, 0, "", "")
+    build_time = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    indices = random.sample(range(len(plan)), 10000)
+    start = time.perf_counter()
+    for i in indices:
+        plan[i]
+    access_time = time.perf_counter() - start
+    print(f"  {label:<7} {size / 1e6:9.1f} MB   build {build_time:6.2f} s   "
+          f"10000 random reads {access_time * 1000:6.1f} ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    sources = [f"shot_v003.{i + 1:07d}.png" for i in range(count)]
+    print(f"{count} files")
+    measure("tuples", tuple_plan, sources)
+    measure("plan", renamer.plan_renames, sources)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Count rename syscalls and time for the dependency-ordered executor versus the
+old blanket two-phase executor.
+
+Jobs: renumber into fresh names, shift the sequence by +1 (one long chain),
+and swap pairs of frames (many two-file cycles).
+
+Usage: python benchmarks/bench_rename.py [file_count]
+"""
+
+import shutil
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from _common import bench_dir, load_renamer, make_sequence
+
+renamer = load_renamer()
+
+
+def legacy_two_phase_rename(renames, folder_path):
+    """The original executor: every changed file goes through a temporary name."""
+    folder = Path(folder_path)
+    temp_names = []
+    for old_path, new_name in renames:
+        if old_path.name != new_name:
+            temp_path = folder / f"temp_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{old_path.name}"
+            old_path.rename(temp_path)
+            temp_names.append((temp_path, new_name))
+    for temp_path, new_name in temp_names:
+        temp_path.rename(folder / new_name)
+
+
+def fresh_names(files):
+    return [(path, f"out_{i:07d}.png") for i, path in enumerate(files)]
+
+
+def shift_by_one(files):
+    return [(path, f"f_{i + 2:07d}.png") for i, path in enumerate(files)]
+
+
+def swap_pairs(files):
+    renames = []
+    for i in range(0, len(files) - 1, 2):
+        renames.append((files[i], files[i + 1].name))
+        renames.append((files[i + 1], files[i].name))
+    return renames
+
+
+def run(label, executor, job, count):
+    folder = bench_dir()
+    try:
+        make_sequence(folder, count, basename="f_")
+        renames = job(renamer.get_png_files(folder, "Name"))
+        # Count at the call sites each executor uses (Path.rename / DirRenamer.rename);
+        # wrapping os.rename itself would hide it from os.supports_dir_fd
+        calls = [0]
+        patched = [(Path, 'rename'), (renamer.DirRenamer, 'rename')]
+        saved = [getattr(cls, name) for cls, name in patched]
+
+        def counting(func):
+            def wrapper(*args, **kwargs):
+                calls[0] += 1
+                return func(*args, **kwargs)
+            return wrapper
+
+        for (cls, name), func in zip(patched, saved):
+            setattr(cls, name, counting(func))
+        try:
+            start = time.perf_counter()
+            executor(renames, folder)
+            elapsed = time.perf_counter() - start
+        finally:
+            for (cls, name), func in zip(patched, saved):
+                setattr(cls, name, func)
+        print(f"  {label:<10} {elapsed * 1000:9.1f} ms   {calls[0]:>8} renames")
+    finally:
+        shutil.rmtree(folder)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for job in (fresh_names, shift_by_one, swap_pairs):
+        print(f"{job.__name__} ({count} files)")
+        run("two-phase", legacy_two_phase_rename, job, count)
+        run("ordered", renamer.two_phase_rename, job, count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Compare the os.scandir scanner against the old Path.iterdir implementation.
+
+Reports wall time and filesystem calls per file for every sort mode (see
+_common.CallCounter for what is counted).
+
+Usage: python benchmarks/bench_scan.py [file_count]
+"""
+
+import shutil
+import sys
+import time
+from pathlib import Path
+
+from _common import CallCounter, bench_dir, load_renamer, make_sequence
+
+renamer = load_renamer()
+
+
+def legacy_get_png_files(folder_path, sort_mode):
+    """The original iterdir/is_file/stat implementation, kept for comparison."""
+    folder = Path(folder_path)
+    if not folder.exists() or not folder.is_dir():
+        return []
+    png_files = [p for p in folder.iterdir() if p.is_file() and p.suffix.lower() == '.png']
+    if sort_mode == "Name":
+        png_files.sort(key=lambda x: renamer.natural_sort_key(x.name))
+    elif sort_mode == "Modified":
+        png_files.sort(key=lambda x: x.stat().st_mtime)
+    elif sort_mode == "Created":
+        png_files.sort(key=lambda x: x.stat().st_ctime)
+    return png_files
+
+
+def run(label, func, folder, sort_mode, count):
+    # Time and count in separate runs so the counting shims do not skew timings
+    start = time.perf_counter()
+    files = func(folder, sort_mode)
+    elapsed = time.perf_counter() - start
+    with CallCounter() as counter:
+        func(folder, sort_mode)
+    assert len(files) == count, (label, len(files))
+    print(f"  {label:<8} {elapsed * 1000:9.1f} ms   {counter.calls / count:5.2f} calls/file")
+    return files
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    folder = bench_dir()
+    try:
+        make_sequence(folder, count, extra=count // 100)
+        for sort_mode in ("Name", "Modified", "Created"):
+            print(f"{sort_mode} ({count} files)")
+            old = run("iterdir", legacy_get_png_files, folder, sort_mode, count)
+            new = run("scandir", renamer.get_png_files, folder, sort_mode, count)
+            if sort_mode == "Name":
+                assert [p.name for p in old] == [p.name for p in new]
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Time group_sequences on synthetic multi-pass folders to check it stays linear.
+
+Names are generated in memory (no files): `passes` render passes of
+shot010_<pass>.#######.png, shuffled together, plus a few unnumbered files.
+
+Usage: python benchmarks/bench_sequences.py [passes] [file_count ...]
+"""
+
+import random
+import sys
+import time
+
+from _common import load_renamer
+
+renamer = load_renamer()
+
+
+def synthetic_paths(passes, count):
+    paths = [f"/renders/shot010/shot010_pass{i % passes:02d}.{i // passes + 1:07d}.png" for i in range(count)]
+    paths += [f"/renders/shot010/contact_sheet_v{i}.png" for i in range(3)]
+    random.Random(0).shuffle(paths)
+    return paths
+
+
+def main():
+    passes = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    counts = [int(arg) for arg in sys.argv[2:]] or [250000, 1000000, 4000000]
+    for count in counts:
+        paths = synthetic_paths(passes, count)
+        start = time.perf_counter()
+        sequences, unnumbered = renamer.group_sequences(paths)
+        elapsed = time.perf_counter() - start
+        print(f"  {count:>8} files  {len(sequences):>3} sequences  {len(unnumbered)} unnumbered   "
+              f"{elapsed:6.2f} s   {elapsed / count * 1e9:6.0f} ns/file")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Time a first preview against re-previews with changed naming options.
+
+The uncached path is what Preview did before RenameSession: scan, sort, plan
+and detect_collisions on every click. Re-previews through the session reuse
+the scan and only check the names that are not being renamed.
+
+Usage: python benchmarks/bench_session.py [file_count]
+"""
+
+import shutil
+import sys
+import time
+from pathlib import Path
+
+from _common import bench_dir, load_renamer, make_sequence
+
+renamer = load_renamer()
+
+# (basename, start_index, zero_padding, prefix, suffix) tried one after another
+TEMPLATES = [("frame", 1, 0, "", ""), ("frame", 1001, 0, "", ""), ("frame", 1001, 6, "", ""),
+             ("frame", 1001, 6, "sh010_", ""), ("frame", 1001, 6, "sh010_", "_v2")]
+
+
+def uncached_preview(folder, options):
+    listing = set()
+    entries = renamer.scan_folder(folder, "Name", listing=listing)
+    renames = renamer.plan_renames([Path(entry.path) for entry in entries], *options)
+    return renames, renamer.detect_collisions(renames, folder, existing_names=listing)
+
+
+def session_preview(session, folder, options):
+    session.scan(folder, "Name")
+    return session.plan(*options)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    folder = bench_dir()
+    try:
+        make_sequence(folder, count, extra=count // 100)
+        session = renamer.RenameSession()
+        print(f"{count} files, {len(TEMPLATES)} naming changes")
+        for label, preview in (("uncached", lambda options: uncached_preview(folder, options)),
+                               ("session", lambda options: session_preview(session, folder, options))):
+            times = []
+            for options in TEMPLATES:
+                start = time.perf_counter()
+                preview(options)
+                times.append((time.perf_counter() - start) * 1000)
+            rest = sum(times[1:]) / (len(times) - 1)
+            print(f"  {label:<9} first {times[0]:8.1f} ms   later changes {rest:8.2f} ms each")
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Compare the natural sort key with the original list-based version on
+synthetic frame names: key build time, sort time, memory held by the keys,
+and that both give the same order. Then compare sorting one shuffled
+sequence by natural_sort_key with FrameIndex (integer frame sort), as
+scan_folder does for the "Name" sort mode.
+
+Usage: python benchmarks/bench_sort.py [name_count]
+"""
+
+import random
+import re
+import sys
+import time
+import tracemalloc
+
+from _common import load_renamer
+
+renamer = load_renamer()
+
+
+def legacy_natural_sort_key(text):
+    """The original key: uncompiled re.split and a list per name."""
+    return [int(t) if t.isdigit() else t.lower() for t in re.split(r'(\d+)', str(text))]
+
+
+def synthetic_names(count):
+    """Shuffled names from a few sequence shapes, mostly <stem><digits>.png."""
+    shapes = ["shotA_v003.{:07d}.png", "frame_{:04d}.png", "Comp_Main.{:d}.PNG", "render{:05d}_beauty.png"]
+    names = [shapes[i % len(shapes)].format(i // len(shapes)) for i in range(count)]
+    random.Random(0).shuffle(names)
+    return names
+
+
+def measure(label, key, names):
+    tracemalloc.start()
+    start = time.perf_counter()
+    keys = [key(name) for name in names]
+    key_time = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del keys
+    
+    start = time.perf_counter()
+    ordered = sorted(names, key=key)
+    sort_time = time.perf_counter() - start
+    print(f"  {label:<7} keys {key_time:6.2f} s {size / 1e6:8.1f} MB   sort {sort_time:6.2f} s")
+    return ordered
+
+
+def measure_order(label, order, names):
+    start = time.perf_counter()
+    result = order(names)
+    elapsed = time.perf_counter() - start
+    # Separate run for memory; tracemalloc slows allocation-heavy code unevenly
+    tracemalloc.start()
+    order(names)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {label:<10} {elapsed:6.2f} s   peak {peak / 1e6:8.1f} MB")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    names = synthetic_names(count)
+    print(f"{count} names")
+    legacy = measure("legacy", legacy_natural_sort_key, names)
+    current = measure("current", renamer.natural_sort_key, names)
+    print(f"  same order: {legacy == current}")
+    
+    names = [f"shotA_v003.{i:07d}.png" for i in range(count)]
+    random.Random(1).shuffle(names)
+    print(f"{count} frames of one sequence, shuffled")
+    by_key = measure_order("sort key", lambda names: sorted(range(len(names)), key=lambda i: renamer.natural_sort_key(names[i])), names)
+    by_frame = measure_order("FrameIndex", lambda names: renamer.FrameIndex(names).order(), names)
+    print(f"  same order: {by_key == by_frame}")
+
+
+if __name__ == "__main__":
+    main()
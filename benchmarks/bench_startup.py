@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Measure CLI cold start and import cost, and check that the CLI stays headless.
+
+Runs `scan` on an empty folder in fresh interpreters:
+
+- wall time of the launcher script, median against STARTUP_BUDGET_MS;
+- import time of the package (including every stdlib module it pulls in) from
+  `python -X importtime`, best run against IMPORT_BUDGET_MS;
+- the import list must not contain tkinter or the network modules.
+
+Exits with status 1 if any check fails, so it can guard against regressions.
+
+Usage: python benchmarks/bench_startup.py [runs]
+"""
+
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+from _common import APP_FILE, ROOT, bench_dir
+
+# Interpreter start-up itself is included; measured at about 35 ms on Linux
+STARTUP_BUDGET_MS = 150
+# Package import cost, interpreter excluded; measured at about 13 ms on Linux
+IMPORT_BUDGET_MS = 25
+FORBIDDEN_MODULES = ('tkinter', '_tkinter', 'urllib.request', 'http.client', 'json', 'zipfile')
+
+PROBE = "import sys; from png_sequence_renamer.cli import main; main(['scan', sys.argv[1]])"
+
+
+def import_profile(folder):
+    """Return (package import ms, set of imported module names) for one CLI run."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', PROBE, folder], cwd=ROOT,
+                            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or line.endswith('imported package'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.add(name.strip())
+        # Top-level entries are not indented; they include their own imports
+        if name.startswith(' png_sequence_renamer'):
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    folder = bench_dir()
+    try:
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, str(APP_FILE), 'scan', folder], check=True,
+                           stdout=subprocess.DEVNULL)
+            times.append((time.perf_counter() - start) * 1000)
+        profiles = [import_profile(folder) for _ in range(runs)]
+    finally:
+        shutil.rmtree(folder)
+
+    median = statistics.median(times)
+    import_ms = min(ms for ms, _ in profiles)
+    loaded = sorted(name for name in FORBIDDEN_MODULES if name in profiles[0][1])
+
+    print(f"cli cold start: median {median:.1f} ms over {runs} runs (budget {STARTUP_BUDGET_MS} ms)")
+    print(f"package import: best {import_ms:.1f} ms (budget {IMPORT_BUDGET_MS} ms)")
+    print(f"heavy modules imported: {', '.join(loaded) or 'none'}")
+    if median > STARTUP_BUDGET_MS or import_ms > IMPORT_BUDGET_MS or loaded:
+        print("FAIL")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
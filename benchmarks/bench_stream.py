@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Compare peak Python memory of the list pipeline and the streaming pipeline.
+
+The list pipeline is get_png_files -> plan_renames -> two_phase_rename ->
+write_log; the streaming pipeline is stream_renames -> write_log. Peak memory
+is measured with tracemalloc, so absolute times are inflated.
+
+Usage: python benchmarks/bench_stream.py [chunk_size] [file_count ...]
+"""
+
+import os
+import shutil
+import sys
+import time
+import tracemalloc
+
+from _common import bench_dir, load_renamer, make_sequence
+
+renamer = load_renamer()
+
+
+def list_pipeline(folder, log_path, chunk_size):
+    files = renamer.get_png_files(folder, "Name")
+    renames = renamer.plan_renames(files, "frame", 1, 0, "", "")
+    renamer.write_log(renamer.two_phase_rename(renames, folder), log_path)
+
+
+def stream_pipeline(folder, log_path, chunk_size):
+    completed = renamer.stream_renames(folder, "Name", "frame", 1, 0, "", "", chunk_size=chunk_size)
+    renamer.write_log(completed, log_path)
+
+
+def measure(pipeline, count, chunk_size):
+    folder = bench_dir()
+    log_path = folder + ".csv"
+    try:
+        make_sequence(folder, count)
+        tracemalloc.start()
+        start = time.perf_counter()
+        pipeline(folder, log_path, chunk_size)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return elapsed, peak
+    finally:
+        shutil.rmtree(folder)
+        if os.path.exists(log_path):
+            os.remove(log_path)
+
+
+def main():
+    chunk_size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    counts = [int(arg) for arg in sys.argv[2:]] or [10000, 40000, 160000]
+    print(f"chunk_size={chunk_size}")
+    for count in counts:
+        for label, pipeline in (("list", list_pipeline), ("stream", stream_pipeline)):
+            elapsed, peak = measure(pipeline, count, chunk_size)
+            print(f"  {count:>8} files  {label:<7} {elapsed:7.2f} s   peak {peak / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
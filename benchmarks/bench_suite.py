@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Regression suite: time the core pipeline on synthetic folders against a JSON baseline.
+
+For each size, a folder of empty PNG files with messy naming is built on
+tmpfs (_common.make_messy_sequence) and these cases are timed, best of a few
+runs each:
+
+    natural_sort_key            sorting the shuffled file names
+    get_png_files(<mode>)       Name, Modified and Created order
+    plan_renames                planning and formatting every target name
+    detect_collisions           with the listing from the scan, like the CLI
+    two_phase_rename            renaming the whole folder
+    write_log                   CSV log of those renames
+    undo_from_log               renaming everything back
+
+Filesystem calls of every case are counted with the instrument module too.
+Unlike times they do not depend on the machine, so any increase is a
+regression; a time is one if it exceeds the baseline by more than threshold
+(and by more than NOISE_FLOOR_S). Results are compared with the baseline file
+when it exists, and written to it with --save. Exits with status 1 on a
+regression, like bench_startup.py.
+
+Usage: python benchmarks/bench_suite.py [--sizes 10,10000,100000,1000000]
+                                        [--baseline FILE] [--save] [--threshold 0.25]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import time
+
+from _common import ROOT, bench_dir, load_renamer, make_messy_sequence
+
+renamer = load_renamer()
+from png_sequence_renamer.instrument import recording  # noqa: E402
+
+DEFAULT_SIZES = (10, 10000, 100000)
+DEFAULT_BASELINE = ROOT / "benchmarks" / "baseline.json"
+DEFAULT_THRESHOLD = 0.25
+# Slowdowns smaller than this are timer noise, whatever the ratio
+NOISE_FLOOR_S = 0.001
+SORT_MODES = ("Name", "Modified", "Created")
+
+
+def repeats_for(size):
+    return 5 if size <= 10000 else 3 if size <= 100000 else 1
+
+
+def measure(func):
+    """Run func once; return (result, seconds, filesystem calls)."""
+    gc.collect()
+    with recording() as recorder:
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+    fs_calls = sum(amount for name, amount in recorder.counters.items() if name.startswith('fs.'))
+    return result, elapsed, fs_calls
+
+
+def run_size(size, results):
+    """Time every case on a folder of size files and add them to results."""
+    folder = bench_dir()
+    log_dir = bench_dir()
+    log_path = os.path.join(log_dir, "rename_log.csv")
+    best = {}
+    
+    def record(case, seconds, fs_calls):
+        key = f"{case}@{size}"
+        if key not in best or seconds < best[key]['seconds']:
+            best[key] = {'seconds': seconds, 'fs_calls': fs_calls}
+    
+    try:
+        make_messy_sequence(folder, size)
+        names = [entry.name for entry in renamer.iter_png_entries(folder)]
+        random.Random(size).shuffle(names)
+        for _ in range(repeats_for(size)):
+            _, seconds, fs_calls = measure(lambda: sorted(names, key=renamer.natural_sort_key))
+            record("natural_sort_key", seconds, fs_calls)
+            for sort_mode in SORT_MODES:
+                _, seconds, fs_calls = measure(lambda: renamer.get_png_files(folder, sort_mode))
+                record(f"get_png_files({sort_mode})", seconds, fs_calls)
+            
+            listing = set()
+            sources = [entry.path for entry in renamer.scan_folder(folder, "Name", listing=listing)]
+            renames, seconds, fs_calls = measure(
+                lambda: list(renamer.plan_renames(sources, "frame", 1, 0, "", "")))
+            record("plan_renames", seconds, fs_calls)
+            collisions, seconds, fs_calls = measure(
+                lambda: renamer.detect_collisions(renames, folder, existing_names=listing))
+            record("detect_collisions", seconds, fs_calls)
+            if collisions:
+                raise RuntimeError(f"Benchmark plan collides: {collisions[0]}")
+            
+            completed, seconds, fs_calls = measure(lambda: renamer.two_phase_rename(renames, folder))
+            record("two_phase_rename", seconds, fs_calls)
+            _, seconds, fs_calls = measure(lambda: renamer.write_log(completed, log_path))
+            record("write_log", seconds, fs_calls)
+            _, seconds, fs_calls = measure(lambda: renamer.undo_from_log(log_path))
+            record("undo_from_log", seconds, fs_calls)
+    finally:
+        shutil.rmtree(folder)
+        shutil.rmtree(log_dir)
+    
+    for key, result in best.items():
+        print(f"  {key:<34} {result['seconds'] * 1000:10.2f} ms  {result['fs_calls']:>9} fs calls")
+    results.update(best)
+
+
+def compare(results, baseline, threshold):
+    """Print every case against the baseline and return the keys that regressed."""
+    regressions = []
+    print(f"against baseline (threshold +{threshold * 100:.0f}%):")
+    for key, result in results.items():
+        old = baseline['results'].get(key)
+        if old is None:
+            print(f"  {key:<34} new case")
+            continue
+        ratio = result['seconds'] / old['seconds'] if old['seconds'] > 0 else 1.0
+        slower = (result['seconds'] > old['seconds'] * (1 + threshold)
+                  and result['seconds'] - old['seconds'] > NOISE_FLOOR_S)
+        more_calls = result['fs_calls'] > old['fs_calls']
+        flags = []
+        if slower:
+            flags.append("SLOWER")
+        if more_calls:
+            flags.append(f"FS CALLS {old['fs_calls']} -> {result['fs_calls']}")
+        if flags:
+            regressions.append(key)
+        print(f"  {key:<34} {ratio:6.2f}x  {' '.join(flags)}".rstrip())
+    return regressions
+
+
+def machine():
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'cpus': os.cpu_count()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the core pipeline against a JSON baseline.")
+    parser.add_argument('--sizes', default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated folder sizes (default: %(default)s)")
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help="baseline JSON file")
+    parser.add_argument('--save', action='store_true', help="write the results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction (default: %(default)s)")
+    args = parser.parse_args()
+    
+    results = {}
+    for size in (int(size) for size in args.sizes.split(",")):
+        print(f"{size} files")
+        run_size(size, results)
+    
+    if args.save:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'machine': machine(), 'results': results}, f, indent=2)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --save to create one")
+        return 0
+    
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline['machine'] != machine():
+        print(f"note: baseline was recorded on {baseline['machine']['platform']}, "
+              f"Python {baseline['machine']['python']}; times may not compare")
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"FAIL: {len(regressions)} regressions")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Watch mode latency: time from a frame being closed to it being renamed.
+
+A writer thread writes `count` small frames into a scratch folder while
+watch_folder runs, and each frame's latency is taken from the moment its file
+was closed to the on_rename callback. Runs with inotify (where available) and
+with the polling fallback.
+
+Usage: python benchmarks/bench_watch.py [count] [poll_interval]
+"""
+
+import os
+import shutil
+import statistics
+import sys
+import threading
+import time
+
+from _common import bench_dir, load_renamer
+
+load_renamer()
+from png_sequence_renamer.watch import InotifyWatcher, watch_folder  # noqa: E402
+
+
+def run(label, count, polling, interval):
+    folder = bench_dir()
+    closed = {}
+    latencies = []
+    done = threading.Event()
+    
+    def on_rename(old_name, new_name):
+        latencies.append(time.perf_counter() - closed[old_name])
+        if len(latencies) == count:
+            done.set()
+    
+    def write_frames():
+        time.sleep(0.2)  # let the watcher start
+        for i in range(count):
+            name = f"render.{i + 1:04d}.png"
+            with open(os.path.join(folder, name), 'wb') as f:
+                f.write(b'\x89PNG' + bytes(1024))
+            closed[name] = time.perf_counter()
+            time.sleep(0.002)
+    
+    writer = threading.Thread(target=write_frames)
+    writer.start()
+    try:
+        watch_folder(folder, "frame", 1, 4, "", "", on_rename=on_rename, stop=done.is_set,
+                     polling=polling, interval=interval)
+    finally:
+        writer.join()
+        shutil.rmtree(folder)
+    latencies.sort()
+    print(f"  {label:<8} {count} frames   median {statistics.median(latencies) * 1000:7.2f} ms   "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:7.2f} ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    interval = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    probe = bench_dir()
+    try:
+        InotifyWatcher(probe).close()
+    except OSError:
+        print("  inotify unavailable")
+    else:
+        run("inotify", count, False, interval)
+    finally:
+        os.rmdir(probe)
+    run("polling", count, True, interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+PNG Sequence Renamer
+
+Core package for scanning, planning, renaming and undoing PNG sequences. The
+Tk interface (png_sequence_renamer.gui) and the update checker
+(png_sequence_renamer.updater) are subpackages imported only when used.
+
+The public functions below are re-exported here but loaded from their module
+on first access, so `import png_sequence_renamer` stays cheap.
+"""
+
+# Version information
+__version__ = "1.0.0"
+__author__ = "Your Name"
+
+_EXPORTS = {
+    'PROGRESS_INTERVAL': 'progress',
+    'JobCancelled': 'progress',
+    'natural_sort_key': 'sorting',
+    'FrameIndex': 'sorting',
+    'ScanEntry': 'scanner',
+    'iter_png_entries': 'scanner',
+    'entry_sort_key': 'scanner',
+    'scan_folder': 'scanner',
+    'get_png_files': 'scanner',
+    'cached_scan': 'index_cache',
+    'CASE_INSENSITIVE_FS': 'planner',
+    'resolve_padding': 'planner',
+    'format_target_name': 'planner',
+    'RenamePlan': 'planner',
+    'GroupedPlan': 'planner',
+    'plan_renames': 'planner',
+    'detect_collisions': 'planner',
+    'FrameSequence': 'sequences',
+    'group_sequences': 'sequences',
+    'plan_sequence_renames': 'sequences',
+    'analyze_sequence': 'analysis',
+    'analyze_sequences': 'analysis',
+    'analyze_folder': 'analysis',
+    'summarize_analysis': 'analysis',
+    'RenameSession': 'session',
+    'find_sequence_folders': 'batch',
+    'run_batch': 'batch',
+    'WatchIndex': 'watch',
+    'watch_folder': 'watch',
+    'DirRenamer': 'executor',
+    'plan_rename_steps': 'executor',
+    'two_phase_rename': 'executor',
+    'parallel_rename': 'executor',
+    'StepRunner': 'executor',
+    'JOURNAL_NAME': 'journal',
+    'RenameJournal': 'journal',
+    'journal_path_for': 'journal',
+    'read_journal': 'journal',
+    'recover_journal': 'journal',
+    'COMPACT_LOG_NAME': 'log',
+    'write_log': 'log',
+    'write_compact_log': 'log',
+    'LogAppender': 'log',
+    'iter_log': 'log',
+    'find_log': 'log',
+    'undo_from_log': 'log',
+    'Recorder': 'instrument',
+    'recording': 'instrument',
+    'MetricsRecorder': 'metrics',
+    'export_metrics': 'metrics',
+    'STREAM_CHUNK_SIZE': 'streaming',
+    'external_sort': 'streaming',
+    'iter_plan': 'streaming',
+    'stream_two_phase_rename': 'streaming',
+    'stream_renames': 'streaming',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
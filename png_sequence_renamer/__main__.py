@@ -0,0 +1,9 @@
+"""
+Allow `python -m png_sequence_renamer`.
+"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Gap and duplicate-frame analysis of the sequences in a folder.
+
+The analysis works on the run-length form group_sequences already records
+(FrameSequence.runs: one (start, end) pair per stretch of consecutive frames),
+not on the frames themselves. A scan sorted by name yields one run per gap, so
+a 10M-frame sequence with a few holes is analysed in milliseconds; only
+duplicate frames, which show up as overlapping runs, send it back to the
+per-file frame numbers to find the files involved.
+
+Unsorted input (e.g. a scan sorted by date) breaks runs up, down to one per
+file. Then the frames are marked in a presence map instead, one byte per frame
+between the first and the last, and the gaps are read off it with
+bytearray.find, which skips whole stretches of present frames in C.
+"""
+
+import os
+from bisect import bisect_right
+
+from .instrument import timed
+from .scanner import scan_folder
+from .sequences import group_sequences, sequence_label
+
+# More runs than this are analysed with a presence map rather than by sorting
+RUN_LIMIT = 65536
+# Largest presence map in bytes (= frames); wider, fragmented ranges are sorted
+BITMAP_LIMIT = 64 * 1024 * 1024
+
+
+def merge_runs(runs):
+    """Merge a flat start, end, start, end, ... array of frame runs.
+
+    Returns (missing, overlaps): the inclusive frame ranges between the
+    merged runs and the ranges covered by more than one run, both sorted.
+    """
+    pairs = sorted(zip(runs[::2], runs[1::2]))
+    missing = []
+    overlaps = []
+    covered = pairs[0][1]
+    for start, end in pairs[1:]:
+        if start > covered + 1:
+            missing.append((covered + 1, start - 1))
+        elif start <= covered:
+            overlaps.append((start, min(end, covered)))
+        if end > covered:
+            covered = end
+    return missing, overlaps
+
+
+def scan_bitmap(frames, first, last):
+    """Find gaps and repeated frames of frames (all within first..last) with a presence map.
+
+    Returns (missing, overlaps) like merge_runs, with one overlap per
+    repeated frame number.
+    """
+    seen = bytearray(last - first + 1)
+    repeated = set()
+    for frame in frames:
+        offset = frame - first
+        if seen[offset]:
+            repeated.add(frame)
+        else:
+            seen[offset] = 1
+    
+    missing = []
+    find = seen.find
+    start = find(0)
+    while start != -1:
+        # The last frame is present, so every gap ends inside the map
+        end = find(1, start)
+        missing.append((first + start, first + end - 1))
+        start = find(0, end)
+    return missing, [(frame, frame) for frame in sorted(repeated)]
+
+
+def _duplicate_files(sequence, overlaps):
+    """Return {frame, files} for every frame number in overlaps used by several files."""
+    # Overlaps can overlap each other; merge them so they can be bisected
+    ranges = []
+    for start, end in overlaps:
+        if ranges and start <= ranges[-1][1] + 1:
+            ranges[-1][1] = max(ranges[-1][1], end)
+        else:
+            ranges.append([start, end])
+    starts = [start for start, _ in ranges]
+    
+    names = {}
+    for frame, path in zip(sequence.frames, sequence.paths):
+        i = bisect_right(starts, frame) - 1
+        if i >= 0 and frame <= ranges[i][1]:
+            names.setdefault(frame, []).append(os.path.basename(path))
+    return [{'frame': frame, 'files': names[frame]}
+            for frame in sorted(names) if len(names[frame]) > 1]
+
+
+def analyze_sequence(sequence):
+    """Return the gap and duplicate report of one FrameSequence as a dict.
+
+    Keys: sequence (label), first, last, files, missing (inclusive (first,
+    last) frame ranges), missing_frames and duplicates ({frame, files} for
+    every frame number used by more than one file, e.g. 7 and 0007).
+    """
+    runs = sequence.runs
+    first = min(runs[::2])
+    last = max(runs[1::2])
+    if len(runs) // 2 > RUN_LIMIT and last - first < BITMAP_LIMIT:
+        missing, overlaps = scan_bitmap(sequence.frames, first, last)
+    else:
+        missing, overlaps = merge_runs(runs)
+    return {
+        'sequence': sequence_label(sequence),
+        'first': first,
+        'last': last,
+        'files': len(sequence.paths),
+        'missing': missing,
+        'missing_frames': sum(end - start + 1 for start, end in missing),
+        'duplicates': _duplicate_files(sequence, overlaps) if overlaps else [],
+    }
+
+
+@timed('analyze')
+def analyze_sequences(sequences, unnumbered):
+    """Return the analysis report for the output of group_sequences.
+
+    Files that do not fit a sequence are listed under out_of_pattern: names
+    without a frame number and, when the folder holds at least one real
+    sequence, numbered files that are alone in their pattern (a stray
+    "render_v2.png" next to beauty.####.png).
+    """
+    out_of_pattern = [os.path.basename(path) for path in unnumbered]
+    if any(len(sequence.paths) > 1 for sequence in sequences):
+        strays = [sequence for sequence in sequences if len(sequence.paths) == 1]
+        out_of_pattern.extend(os.path.basename(sequence.paths[0]) for sequence in strays)
+        sequences = [sequence for sequence in sequences if len(sequence.paths) > 1]
+    
+    return {
+        'sequences': [analyze_sequence(sequence) for sequence in sequences],
+        'out_of_pattern': out_of_pattern,
+    }
+
+
+def analyze_folder(folder_path, progress=None):
+    """Scan a folder and return its analysis report, with the folder added."""
+    entries = scan_folder(folder_path, "Name", progress=progress)
+    report = analyze_sequences(*group_sequences(entry.path for entry in entries))
+    report['folder'] = os.fspath(folder_path)
+    return report
+
+
+def format_ranges(ranges):
+    """Format frame ranges as e.g. "50, 120-121"."""
+    return ", ".join(str(first) if first == last else f"{first}-{last}" for first, last in ranges)
+
+
+def _count(number, noun):
+    return f"{number} {noun}{'' if number == 1 else 's'}"
+
+
+def summarize_analysis(report):
+    """Return a one-line summary of an analysis report, e.g. for a status bar."""
+    sequences = report['sequences']
+    gaps = sum(len(result['missing']) for result in sequences)
+    missing = sum(result['missing_frames'] for result in sequences)
+    duplicates = sum(len(result['duplicates']) for result in sequences)
+    strays = len(report['out_of_pattern'])
+    
+    problems = []
+    if gaps:
+        problems.append(f"{_count(gaps, 'gap')} ({_count(missing, 'missing frame')})")
+    if duplicates:
+        problems.append(_count(duplicates, 'duplicate frame'))
+    if strays:
+        problems.append(f"{_count(strays, 'file')} out of pattern")
+    count = _count(len(sequences), 'sequence')
+    if not problems:
+        return f"{count}, no gaps or duplicates"
+    return f"{count}: " + ", ".join(problems)
@@ -0,0 +1,174 @@
+"""
+Recursive batch mode
+
+Renumbers every PNG sequence folder under a root, e.g. all shot folders of a
+show. Folders are found with one os.scandir per directory and each one then
+goes through the usual scan -> plan -> collision check -> rename pipeline in
+a worker process, so folders are handled in parallel and one failing folder
+(collisions, permissions, an interrupted earlier job) never stops the others.
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .executor import two_phase_rename
+from .instrument import count, current, recording, timed
+from .journal import JOURNAL_NAME, journal_path_for
+from .log import COMPACT_LOG_NAME, write_compact_log, write_log
+from .planner import detect_collisions, plan_renames
+from .scanner import scan_folder
+from .sequences import group_sequences, plan_sequence_renames
+
+# Folders are mostly waiting on the filesystem, so run more of them than cores
+BATCH_WORKERS_PER_CPU = 2
+# ProcessPoolExecutor limit on Windows (WaitForMultipleObjects)
+WINDOWS_MAX_WORKERS = 61
+
+
+@timed('find_folders')
+def find_sequence_folders(root):
+    """Return every folder under root (root included) that holds a PNG file, in walk order.
+
+    Symlinked directories are not followed, and unreadable ones are skipped.
+    """
+    folders = []
+    pending = [os.fspath(root)]
+    while pending:
+        folder = pending.pop()
+        has_png = False
+        subfolders = []
+        count('fs.scandir')
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        subfolders.append(entry.path)
+                    elif not has_png:
+                        name = entry.name
+                        has_png = len(name) > 4 and name[-4:].lower() == '.png' and entry.is_file()
+        except OSError:
+            continue
+        if has_png:
+            folders.append(folder)
+        # Reversed so the walk visits subfolders in listing order
+        pending.extend(reversed(subfolders))
+    return folders
+
+
+def rename_folder(folder, options):
+    """Run the scan/plan/collision/rename pipeline on one folder; never raises.
+
+    options is a dict with basename, start, padding, prefix, suffix, sort,
+    split, compact_log and dry_run. Returns a dict with folder, status
+    ("renamed", "planned" for a dry run, "unchanged" if every file already
+    has its planned name, "collisions", "interrupted" or "error"), files and
+    message. An unchanged folder keeps its rename log, so a batch can be
+    re-run over a partly renamed tree without losing earlier undo logs.
+    """
+    # Absolute, so the rename log works from any directory
+    folder = os.path.abspath(folder)
+    result = {'folder': folder, 'status': "error", 'files': 0, 'message': ""}
+    try:
+        if os.path.exists(journal_path_for(folder)):
+            result['status'] = "interrupted"
+            result['message'] = f"{JOURNAL_NAME} present; run recover first"
+            return result
+        
+        listing = set()
+        entries = scan_folder(folder, options['sort'], listing=listing)
+        sources = [Path(entry.path) for entry in entries]
+        naming = (options['basename'], options['start'], options['padding'],
+                  options['prefix'], options['suffix'])
+        if options['split']:
+            renames = plan_sequence_renames(group_sequences(sources)[0], *naming)
+        else:
+            renames = plan_renames(sources, *naming)
+        
+        collisions = detect_collisions(renames, folder, existing_names=listing)
+        if collisions:
+            result['status'] = "collisions"
+            result['files'] = len(renames)
+            result['message'] = f"{len(collisions)} naming collisions, e.g. {collisions[0]}"
+            return result
+        
+        if all(old_path.name == new_name for old_path, new_name in renames):
+            result['status'] = "unchanged"
+            return result
+        
+        if options['dry_run']:
+            result['status'] = "planned"
+            result['files'] = len(renames)
+            return result
+        
+        completed = two_phase_rename(renames, folder, journal_path=journal_path_for(folder))
+        if options['compact_log']:
+            write_compact_log(completed, os.path.join(folder, COMPACT_LOG_NAME))
+        else:
+            write_log(completed, os.path.join(folder, "rename_log.csv"))
+        result['status'] = "renamed"
+        result['files'] = len(completed)
+    except Exception as e:
+        result['message'] = str(e)
+    return result
+
+
+def _recorded_rename_folder(folder, options):
+    """rename_folder with its phases and counters recorded; returns (result, report)."""
+    with recording() as recorder:
+        result = rename_folder(folder, options)
+    return result, recorder.report()
+
+
+@timed('batch')
+def run_batch(root, options, workers=None, progress=None, folders=None):
+    """Rename every sequence folder under root with a process pool and return a summary dict.
+
+    Summary keys: root, folders, files, counts (status -> folder count) and
+    results (the rename_folder dict of every folder, in walk order).
+    progress(phase, done, total) is called as folders finish. Pass folders to
+    skip the discovery walk. While recording (see instrument), every worker
+    records its folder too and the reports are merged into the Recorder.
+    """
+    root = os.path.abspath(root)
+    if folders is None:
+        folders = find_sequence_folders(root)
+    if workers is None:
+        workers = (os.cpu_count() or 1) * BATCH_WORKERS_PER_CPU
+    if sys.platform == 'win32':
+        workers = min(workers, WINDOWS_MAX_WORKERS)
+    
+    results = {}
+    recorder = current()
+    if folders:
+        with ProcessPoolExecutor(max_workers=min(workers, len(folders))) as pool:
+            task = rename_folder if recorder is None else _recorded_rename_folder
+            futures = {pool.submit(task, folder, options): folder for folder in folders}
+            for future in as_completed(futures):
+                folder = futures[future]
+                try:
+                    result = future.result()
+                    if recorder is not None:
+                        result, report = result
+                        recorder.merge(report)
+                    results[folder] = result
+                except Exception as e:
+                    # The worker process itself died; rename_folder catches everything else
+                    results[folder] = {'folder': folder, 'status': "error", 'files': 0, 'message': str(e)}
+                if progress is not None:
+                    progress("Folders", len(results), len(folders))
+    
+    ordered = [results[folder] for folder in folders]
+    counts = {}
+    for result in ordered:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    for status, folder_count in counts.items():
+        count(f'batch.{status}', folder_count)
+    return {
+        'root': os.fspath(root),
+        'folders': len(ordered),
+        'files': sum(result['files'] for result in ordered if result['status'] in ("renamed", "planned")),
+        'counts': counts,
+        'results': ordered,
+    }
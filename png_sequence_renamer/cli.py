@@ -0,0 +1,387 @@
+"""
+Command line interface
+
+`png-seq-rename <command> ...` exposes the same scan/plan/rename/undo
+functions as the GUI without importing tkinter or the network modules. The
+name is only what usage and error messages show; it is run through the
+launcher script or `python -m png_sequence_renamer` until the project has
+packaging metadata with a console-script entry point for main().
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from . import __version__
+from .executor import parallel_rename, two_phase_rename
+from .index_cache import cached_scan
+from .instrument import start_recording, stop_recording
+from .log import COMPACT_LOG_NAME, find_log, undo_from_log, write_compact_log, write_log
+from .planner import detect_collisions, plan_renames
+from .scanner import scan_folder
+from .sequences import group_sequences, plan_sequence_renames, sequence_label
+
+# Program name in messages; nothing installs a command by this name yet
+CLI_PROG = "png-seq-rename"
+
+
+def _add_naming_arguments(parser):
+    parser.add_argument('-b', '--basename', required=True, help="new base name, e.g. frame")
+    parser.add_argument('--start', type=int, default=1, help="first index (default: 1)")
+    parser.add_argument('--padding', type=int, default=0, help="zero padding, 0 = auto-detect (default: 0)")
+    parser.add_argument('--prefix', default="", help="text before the base name")
+    parser.add_argument('--suffix', default="", help="text after the index")
+
+
+def _add_plan_arguments(parser, folder_help="folder containing the PNG sequence"):
+    parser.add_argument('folder', help=folder_help)
+    _add_naming_arguments(parser)
+    parser.add_argument('--sort', choices=["Name", "Modified", "Created"], default="Name",
+                        help="sort order (default: Name)")
+    parser.add_argument('--split-sequences', action='store_true',
+                        help="number each sequence (render pass) separately, keeping its name")
+
+
+def build_parser():
+    """Build the argparse parser for the command line interface."""
+    import argparse
+    parser = argparse.ArgumentParser(prog=CLI_PROG, description="Batch rename PNG sequences.")
+    parser.add_argument('--version', action='version', version=f"%(prog)s {__version__}")
+    parser.add_argument('--progress', action='store_true', help="report progress on stderr")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="list folders directly instead of through the persistent folder index")
+    parser.add_argument('--stats', action='store_true',
+                        help="print phase timings and filesystem call counts as JSON on stderr")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="add the job's counters and phase latencies to a Prometheus textfile")
+    parser.add_argument('--openmetrics', action='store_true',
+                        help="write the --metrics file in OpenMetrics format")
+    commands = parser.add_subparsers(dest='command', required=True, metavar='command')
+    
+    scan = commands.add_parser('scan', help="list the PNG files in a folder in sort order")
+    scan.add_argument('folder', help="folder containing the PNG sequence")
+    scan.add_argument('--sort', choices=["Name", "Modified", "Created"], default="Name",
+                      help="sort order (default: Name)")
+    
+    sequences = commands.add_parser('sequences', help="list the frame sequences in a folder")
+    sequences.add_argument('folder', help="folder containing the PNG sequences")
+    
+    analyze = commands.add_parser('analyze', help="report missing and duplicate frames of each sequence")
+    analyze.add_argument('folder', help="folder containing the PNG sequences")
+    analyze.add_argument('--json', action='store_true', help="print the report as JSON")
+    
+    plan = commands.add_parser('plan', help="print every planned rename as old<TAB>new")
+    _add_plan_arguments(plan)
+    
+    preview = commands.add_parser('preview', help="summarize the planned renames and check collisions")
+    _add_plan_arguments(preview)
+    preview.add_argument('--limit', type=int, default=20, help="rows to show (default: 20)")
+    
+    rename = commands.add_parser('rename', help="rename the files and write rename_log.csv")
+    _add_plan_arguments(rename)
+    rename.add_argument('--log', help="log file (default: <folder>/rename_log.csv)")
+    rename.add_argument('--compact-log', action='store_true',
+                        help=f"write a compact log, <folder>/{COMPACT_LOG_NAME} by default")
+    rename.add_argument('--workers', type=int,
+                        help="rename with a thread pool of this size, for network shares; "
+                             "without a journal or progress (default: 1)")
+    rename.add_argument('--stream', action='store_true',
+                        help="stream scan/plan/rename with bounded memory (skips the collision check)")
+    
+    batch = commands.add_parser('batch', help="rename the sequences of every folder under a root")
+    _add_plan_arguments(batch, folder_help="root folder, searched recursively for PNG folders")
+    batch.add_argument('--workers', type=int,
+                       help="worker processes (default: twice the number of CPUs)")
+    batch.add_argument('--dry-run', action='store_true', help="plan and check every folder, rename nothing")
+    batch.add_argument('--compact-log', action='store_true',
+                       help=f"write {COMPACT_LOG_NAME} instead of rename_log.csv in each folder")
+    batch.add_argument('--json', action='store_true', help="print the summary report as JSON")
+    
+    watch = commands.add_parser('watch', help="rename frames into the sequence as they are written")
+    watch.add_argument('folder', help="folder the frames are rendered into")
+    _add_naming_arguments(watch)
+    watch.add_argument('--log', help="log file (default: <folder>/rename_log.csv)")
+    watch.add_argument('--poll', action='store_true', help="poll the folder instead of using inotify")
+    watch.add_argument('--interval', type=float, default=1.0,
+                       help="seconds between polls (default: 1.0)")
+    
+    undo = commands.add_parser('undo', help="undo the renames recorded in a log")
+    undo.add_argument('log', help="a rename log, or the folder containing it")
+    
+    recover = commands.add_parser('recover', help="roll back (default) or finish an interrupted rename")
+    recover.add_argument('folder', help="folder containing rename_journal.log")
+    recover.add_argument('--resume', action='store_true',
+                         help="finish the interrupted rename and write rename_log.csv instead")
+    return parser
+
+
+def _print_progress(phase, done, total):
+    if total:
+        sys.stderr.write(f"\r{phase}: {done}/{total}   ")
+    else:
+        sys.stderr.write(f"\r{phase}: {done}   ")
+    sys.stderr.flush()
+
+
+def _scan(args, sort_mode, listing=None, progress=None):
+    """scan_folder for the CLI folder, through the folder index unless --no-cache."""
+    if args.no_cache:
+        return scan_folder(args.folder, sort_mode, listing=listing, progress=progress)
+    return cached_scan(args.folder, sort_mode, listing=listing, progress=progress)
+
+
+def _plan_from_args(args, progress):
+    """Scan and plan a folder from CLI arguments; return (renames, collisions)."""
+    listing = set()
+    entries = _scan(args, args.sort, listing=listing, progress=progress)
+    sources = [Path(entry.path) for entry in entries]
+    if args.split_sequences:
+        sequences, _ = group_sequences(sources)
+        renames = plan_sequence_renames(sequences, args.basename, args.start, args.padding,
+                                        args.prefix, args.suffix)
+    else:
+        renames = plan_renames(sources, args.basename, args.start, args.padding, args.prefix, args.suffix)
+    collisions = detect_collisions(renames, args.folder, existing_names=listing, progress=progress)
+    return renames, collisions
+
+
+def run_cli(argv):
+    """Run the command line interface and return the process exit code."""
+    args = build_parser().parse_args(argv)
+    # Logs and journals record the paths they are given; make them work from any directory
+    if getattr(args, 'folder', None) is not None:
+        args.folder = os.path.abspath(args.folder)
+    recorder = None
+    if args.metrics:
+        from .metrics import MetricsRecorder
+        recorder = start_recording(MetricsRecorder())
+    elif args.stats:
+        recorder = start_recording()
+    
+    code = 1
+    try:
+        code = _run_command(args)
+    finally:
+        if recorder is not None:
+            stop_recording()
+            if args.stats:
+                import json
+                report = recorder.report()
+                report['command'] = args.command
+                print(json.dumps(report, indent=2), file=sys.stderr)
+            if args.metrics:
+                from .metrics import write_metrics
+                try:
+                    write_metrics(args.metrics, recorder, args.command, code == 0, args.openmetrics)
+                except OSError as e:
+                    print(f"{CLI_PROG}: could not write metrics: {e}", file=sys.stderr)
+    return code
+
+
+def _run_command(args):
+    """Run the parsed command and return its exit code."""
+    progress = _print_progress if args.progress else None
+    
+    try:
+        if args.command == 'scan':
+            for entry in _scan(args, args.sort, progress=progress):
+                print(entry.name)
+            return 0
+        
+        if args.command == 'sequences':
+            sequences, unnumbered = group_sequences(
+                Path(entry.path) for entry in _scan(args, "Name", progress=progress))
+            for sequence in sequences:
+                print(f"{sequence_label(sequence)}\t{len(sequence.paths)} files\t"
+                      f"frames {min(sequence.frames)}-{max(sequence.frames)}")
+            if unnumbered:
+                print(f"(no frame number)\t{len(unnumbered)} files")
+            return 0
+        
+        if args.command == 'analyze':
+            from .analysis import analyze_folder, format_ranges, summarize_analysis
+            report = analyze_folder(args.folder, progress=progress)
+            if args.json:
+                import json
+                print(json.dumps(report, indent=2))
+            else:
+                for result in report['sequences']:
+                    print(f"{result['sequence']}\t{result['files']} files\t"
+                          f"frames {result['first']}-{result['last']}")
+                    if result['missing']:
+                        print(f"  missing {result['missing_frames']} frames: {format_ranges(result['missing'])}")
+                    for duplicate in result['duplicates']:
+                        print(f"  duplicate frame {duplicate['frame']}: {', '.join(duplicate['files'])}")
+                for name in report['out_of_pattern']:
+                    print(f"out of pattern: {name}")
+                print(summarize_analysis(report))
+            problems = any(result['missing'] or result['duplicates'] for result in report['sequences'])
+            return 1 if problems or report['out_of_pattern'] else 0
+        
+        if args.command == 'undo':
+            log_path = args.log
+            if os.path.isdir(log_path):
+                log_path = find_log(log_path)
+            undone = undo_from_log(log_path, progress=progress)
+            print(f"Undone {len(undone)} renames")
+            return 0
+        
+        if args.command == 'recover':
+            from .journal import journal_path_for, recover_journal
+            journal_path = journal_path_for(args.folder)
+            if not os.path.exists(journal_path):
+                print(f"{CLI_PROG}: no interrupted rename in {args.folder}", file=sys.stderr)
+                return 1
+            result = recover_journal(journal_path, "resume" if args.resume else "rollback",
+                                     progress=progress)
+            if args.resume:
+                log_path = os.path.join(args.folder, "rename_log.csv")
+                write_log(result['renames'], log_path)
+                print(f"Finished interrupted rename ({result['steps']} steps); log saved to {log_path}")
+                return 0
+            if result['failures']:
+                print(f"{result['failures']} files could not be restored; journal kept", file=sys.stderr)
+                return 1
+            print(f"Rolled back {result['position']} completed steps")
+            return 0
+        
+        if not args.basename.strip():
+            print(f"{CLI_PROG}: error: Basename is required", file=sys.stderr)
+            return 2
+        
+        if args.command == 'watch':
+            from .watch import watch_folder
+            log_path = args.log or os.path.join(args.folder, "rename_log.csv")
+            renamed = [0]
+            
+            def report(old_name, new_name):
+                renamed[0] += 1
+                print(f"{old_name} -> {new_name}", flush=True)
+            
+            try:
+                watch_folder(args.folder, args.basename, args.start, args.padding, args.prefix,
+                             args.suffix, log_path=log_path, on_rename=report, polling=args.poll,
+                             interval=args.interval)
+            except KeyboardInterrupt:
+                pass  # The normal way to stop watching
+            print(f"Renamed {renamed[0]} files; log saved to {log_path}")
+            return 0
+        
+        if args.command == 'batch':
+            from .batch import run_batch
+            options = {'basename': args.basename, 'start': args.start, 'padding': args.padding,
+                       'prefix': args.prefix, 'suffix': args.suffix, 'sort': args.sort,
+                       'split': args.split_sequences, 'compact_log': args.compact_log,
+                       'dry_run': args.dry_run}
+            summary = run_batch(args.folder, options, workers=args.workers, progress=progress)
+            if args.json:
+                import json
+                print(json.dumps(summary, indent=2))
+            else:
+                for result in summary['results']:
+                    if result['status'] not in ("renamed", "planned", "unchanged"):
+                        print(f"{result['folder']}: {result['status']}: {result['message']}")
+                counts = ", ".join(f"{count} {status}" for status, count in sorted(summary['counts'].items()))
+                verb = "to rename" if args.dry_run else "renamed"
+                print(f"{summary['folders']} folders ({counts or 'none found'}); {summary['files']} files {verb}")
+            failed = any(result['status'] not in ("renamed", "planned", "unchanged")
+                         for result in summary['results'])
+            return 1 if failed else 0
+        
+        compact = getattr(args, 'compact_log', False)
+        log_path = getattr(args, 'log', None) or os.path.join(
+            args.folder, COMPACT_LOG_NAME if compact else "rename_log.csv")
+        log_writer = write_compact_log if compact else write_log
+        if args.command == 'rename' and args.stream:
+            if args.split_sequences:
+                print(f"{CLI_PROG}: error: --stream cannot be combined with --split-sequences", file=sys.stderr)
+                return 2
+            from .streaming import stream_renames
+            completed = stream_renames(args.folder, args.sort, args.basename, args.start,
+                                       args.padding, args.prefix, args.suffix)
+            count = [0]
+            state = {'started': False, 'renamed': False}
+            rename_errors = []
+            
+            def counted():
+                state['started'] = True  # the log file has been opened (and truncated)
+                try:
+                    for pair in completed:
+                        count[0] += 1
+                        yield pair
+                except Exception as e:
+                    rename_errors.append(e)
+                    raise
+                state['renamed'] = True
+            
+            try:
+                log_writer(counted(), log_path)
+            except Exception:
+                if not state['renamed']:
+                    # Closing the pipeline rolls back what it renamed, so the partial log goes too
+                    completed.close()
+                    if state['started'] and os.path.isfile(log_path):
+                        os.remove(log_path)
+                if rename_errors:
+                    # The log writer wraps what it reads; report the rename failure itself
+                    raise rename_errors[0] from None
+                raise
+            print(f"Renamed {count[0]} files; log saved to {log_path}")
+            return 0
+        
+        renames, collisions = _plan_from_args(args, progress)
+        if args.command == 'plan':
+            for old_path, new_name in renames:
+                print(f"{old_path.name}\t{new_name}")
+            return 1 if collisions else 0
+        
+        if collisions:
+            for collision in collisions:
+                print(collision, file=sys.stderr)
+            print(f"{len(collisions)} naming collisions; nothing renamed", file=sys.stderr)
+            return 1
+        
+        if args.command == 'preview':
+            for old_path, new_name in renames[:args.limit]:
+                print(f"{old_path.name} -> {new_name}")
+            if len(renames) > args.limit:
+                print(f"... and {len(renames) - args.limit} more")
+            print(f"{len(renames)} files to rename, no collisions")
+            return 0
+        
+        # rename
+        # Only an explicit --workers gives up the journal (and progress) for a thread pool
+        workers = args.workers or 1
+        if workers > 1:
+            stats = {}
+            completed = parallel_rename(renames, args.folder, workers=workers, stats=stats)
+            print(f"{stats['renames']} renames in {stats['seconds']:.2f} s "
+                  f"({stats['renames_per_sec']:.0f} renames/sec, {workers} workers)")
+        else:
+            from .journal import journal_path_for
+            completed = two_phase_rename(renames, args.folder, progress=progress,
+                                         journal_path=journal_path_for(args.folder))
+        log_writer(completed, log_path)
+        print(f"Renamed {len(completed)} files; log saved to {log_path}")
+        return 0
+    
+    except KeyboardInterrupt:
+        print(f"{CLI_PROG}: interrupted", file=sys.stderr)
+        return 130
+    except Exception as e:
+        print(f"{CLI_PROG}: error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if progress is not None:
+            sys.stderr.write("\n")
+
+
+def main(argv=None):
+    """Main entry point: the GUI without arguments, the CLI with them."""
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv:
+        return run_cli(argv)
+    
+    from .gui import main as gui_main
+    return gui_main()
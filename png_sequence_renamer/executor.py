@@ -0,0 +1,441 @@
+"""
+Rename executors: dependency-ordered, no-clobber renames within one folder.
+"""
+
+import errno
+import itertools
+import os
+import sys
+import threading
+import time
+from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
+
+from .instrument import count, timed
+from .progress import PROGRESS_INTERVAL
+
+RENAME_NOREPLACE = 1  # renameat2 flag from <linux/fs.h>
+_renameat2 = None
+
+
+def _load_renameat2():
+    """Return libc renameat2 through ctypes, or False where it is unavailable."""
+    global _renameat2
+    if _renameat2 is None:
+        _renameat2 = False
+        if sys.platform.startswith('linux'):
+            try:
+                import ctypes
+                func = ctypes.CDLL(None, use_errno=True).renameat2
+                func.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+                func.restype = ctypes.c_int
+                _renameat2 = (func, ctypes.get_errno)
+            except (ImportError, OSError, AttributeError):
+                pass  # Old glibc or no ctypes; use the portable path
+    return _renameat2
+
+
+class DirRenamer:
+    """Rename files within one folder by name, never overwriting an existing file.
+
+    Where supported the folder is opened once and every rename is relative to
+    that directory fd, so there is no per-file path resolution. On Linux the
+    rename goes through renameat2(RENAME_NOREPLACE), which fails atomically with
+    FileExistsError when the target exists. Elsewhere, or on filesystems that
+    reject the flag, it falls back to os.rename after an existence check.
+    """
+    
+    def __init__(self, folder_path):
+        self.folder = os.fspath(folder_path)
+        self.dir_fd = None
+        self.noreplace = None
+        if os.rename in os.supports_dir_fd:
+            try:
+                self.dir_fd = os.open(self.folder, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+            except OSError:
+                self.dir_fd = None
+        if self.dir_fd is not None:
+            self.noreplace = _load_renameat2() or None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self):
+        """Release the directory fd."""
+        if self.dir_fd is not None:
+            os.close(self.dir_fd)
+            self.dir_fd = None
+    
+    def rename(self, src_name, dst_name):
+        """Rename src_name to dst_name, raising FileExistsError if dst_name exists."""
+        if self.noreplace is not None:
+            renameat2, get_errno = self.noreplace
+            if renameat2(self.dir_fd, os.fsencode(src_name), self.dir_fd, os.fsencode(dst_name),
+                         RENAME_NOREPLACE) == 0:
+                return
+            err = get_errno()
+            if err not in (errno.EINVAL, errno.ENOSYS):
+                raise OSError(err, os.strerror(err), src_name, None, dst_name)
+            # Kernel or filesystem without RENAME_NOREPLACE; use the fallback from now on
+            self.noreplace = None
+        
+        # Windows os.rename already refuses to overwrite; elsewhere check first
+        if os.name != 'nt' and self._exists_as_other_file(src_name, dst_name):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), src_name, None, dst_name)
+        if self.dir_fd is not None:
+            os.rename(src_name, dst_name, src_dir_fd=self.dir_fd, dst_dir_fd=self.dir_fd)
+        else:
+            os.rename(os.path.join(self.folder, src_name), os.path.join(self.folder, dst_name))
+    
+    def exists(self, name):
+        """Return True if name exists in the folder (without following symlinks)."""
+        try:
+            self._lstat(name)
+        except FileNotFoundError:
+            return False
+        return True
+    
+    def _lstat(self, name):
+        if self.dir_fd is not None:
+            return os.lstat(name, dir_fd=self.dir_fd)
+        return os.lstat(os.path.join(self.folder, name))
+    
+    def _exists_as_other_file(self, src_name, dst_name):
+        try:
+            dst_stat = self._lstat(dst_name)
+        except FileNotFoundError:
+            return False
+        # A case-only rename on a case-insensitive filesystem finds the source itself
+        src_stat = self._lstat(src_name)
+        return (src_stat.st_dev, src_stat.st_ino) != (dst_stat.st_dev, dst_stat.st_ino)
+
+
+def _append_chain(chain, max_chain, temp_name, pre_steps, chains, post_steps):
+    """Add chain to chains, cut into pieces of at most max_chain steps.
+
+    Each cut moves one source to a temporary name up front and back to its
+    target at the end, so the pieces no longer depend on each other.
+    """
+    while max_chain and len(chain) > max_chain:
+        src, dst = chain[max_chain]
+        temp = temp_name(src)
+        pre_steps.append((src, temp))
+        post_steps.append((temp, dst))
+        chains.append(chain[:max_chain])
+        chain = chain[max_chain + 1:]
+    if chain:
+        chains.append(chain)
+
+
+def plan_rename_steps(renames, max_chain=None):
+    """Order renames so that only true cycles go through a temporary name.
+
+    Source and target names form a permutation graph made of simple chains and
+    cycles. Each chain is renamed directly, starting from the end whose target
+    is free; each cycle is opened by moving one file to a temporary name.
+    Returns (pre_steps, chains, post_steps), lists of (src_name, dst_name) pairs
+    to run in that order: the temp moves, every chain in dependency order, then
+    the temp names back to their final targets. Steps within pre_steps and
+    post_steps are independent of each other, and so are the chains. Setting
+    max_chain cuts longer chains with extra temp hops so they can run in parallel.
+    """
+    moves = {}
+    for old_path, new_name in renames:
+        old_name = os.path.basename(old_path)
+        if old_name != new_name:  # Skip if already correctly named
+            moves[old_name] = new_name
+    
+    # Map each target back to the source that will take it
+    sources_by_target = {new_name: old_name for old_name, new_name in moves.items()}
+    if len(sources_by_target) != len(moves):
+        raise ValueError("Duplicate target names in rename plan")
+    
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    temp_name = lambda name: f"temp_{stamp}_{name}"
+    pre_steps, chains, post_steps = [], [], []
+    placed = set()
+    
+    # Chains: start at each source whose target is not itself a pending source
+    for old_name, new_name in moves.items():
+        if new_name in moves:
+            continue
+        chain = []
+        current = old_name
+        while current is not None:
+            chain.append((current, moves[current]))
+            placed.add(current)
+            current = sources_by_target.get(current)
+        _append_chain(chain, max_chain, temp_name, pre_steps, chains, post_steps)
+    
+    # Whatever is left forms cycles; each needs exactly one temporary hop
+    if len(placed) < len(moves):
+        for old_name in moves:
+            if old_name in placed:
+                continue
+            temp = temp_name(old_name)
+            pre_steps.append((old_name, temp))
+            placed.add(old_name)
+            chain = []
+            current = sources_by_target[old_name]
+            while current != old_name:
+                chain.append((current, moves[current]))
+                placed.add(current)
+                current = sources_by_target[current]
+            _append_chain(chain, max_chain, temp_name, pre_steps, chains, post_steps)
+            post_steps.append((temp, moves[old_name]))
+    
+    return pre_steps, chains, post_steps
+
+
+def _completed_renames(renames, folder):
+    """Return (old_path, new_path) for every rename that changes a name, in plan order."""
+    final_renames = []
+    for old_path, new_name in renames:
+        old_name = os.path.basename(old_path)
+        if old_name != new_name:
+            final_renames.append((folder / old_name, folder / new_name))
+    return final_renames
+
+
+# Files named in a rollback_error message; the rest are only counted
+RESTORE_REPORT_LIMIT = 10
+
+
+def rollback_error(error, stranded):
+    """Return the exception to raise when a rollback after error left files behind.
+
+    stranded holds (current_name, original_name) for every file that could not
+    be restored; the first RESTORE_REPORT_LIMIT are named in the message.
+    """
+    names = ", ".join(f"{current} (was {original})" for current, original in stranded[:RESTORE_REPORT_LIMIT])
+    if len(stranded) > RESTORE_REPORT_LIMIT:
+        names += ", ..."
+    return Exception(f"{error}; {len(stranded)} files could not be restored: {names}")
+
+
+class StepRunner:
+    """Apply an ordered list of (src_name, dst_name) steps, optionally journaled.
+
+    position is the number of steps currently applied. Steps run in batches of
+    up to JOURNAL_BATCH so a RenameJournal can record each batch before and
+    after it. A batch never moves the same file twice (a cycle's temp hop and
+    its return), which keeps every state inside it distinct on disk; recovery
+    relies on that to find how far an unfinished batch got.
+    """
+    
+    def __init__(self, renamer, steps, journal=None, position=0):
+        self.renamer = renamer
+        self.steps = steps
+        self.journal = journal
+        self.position = position
+    
+    def _batch_end(self, limit, forward):
+        """Return where the batch starting at position ends, at most limit."""
+        landed = set()
+        if forward:
+            for i in range(self.position, limit):
+                src, dst = self.steps[i]
+                if src in landed:
+                    return i
+                landed.add(dst)
+        else:
+            for i in range(self.position - 1, limit - 1, -1):
+                src, dst = self.steps[i]
+                if dst in landed:
+                    return i + 1
+                landed.add(src)
+        return limit
+    
+    def forward(self, progress=None):
+        """Apply every remaining step."""
+        from .journal import JOURNAL_BATCH
+        steps = self.steps
+        total = len(steps)
+        start = self.position
+        try:
+            while self.position < total:
+                stop = self._batch_end(min(total, self.position + JOURNAL_BATCH), True)
+                if self.journal is not None:
+                    self.journal.begin(self.position, stop)
+                for i in range(self.position, stop):
+                    if progress is not None and i % PROGRESS_INTERVAL == 0:
+                        progress("Renaming", i, total)
+                    src, dst = steps[i]
+                    self.renamer.rename(src, dst)
+                    self.position = i + 1
+                if self.journal is not None:
+                    self.journal.commit(stop)
+        finally:
+            count('fs.rename', self.position - start)
+    
+    def backward(self, progress=None):
+        """Revert every applied step, newest first; return the number that failed."""
+        from .journal import JOURNAL_BATCH
+        steps = self.steps
+        failures = 0
+        start = self.position
+        while self.position > 0:
+            stop = self._batch_end(max(0, self.position - JOURNAL_BATCH), False)
+            if self.journal is not None:
+                self.journal.begin(self.position, stop)
+            for i in range(self.position - 1, stop - 1, -1):
+                if progress is not None and i % PROGRESS_INTERVAL == 0:
+                    progress("Rolling back", len(steps) - i, len(steps))
+                src, dst = steps[i]
+                try:
+                    self.renamer.rename(dst, src)
+                except OSError:
+                    failures += 1
+                self.position = i
+            if self.journal is not None:
+                self.journal.commit(stop)
+        count('fs.rename', start - self.position)
+        count('rollback.failures', failures)
+        return failures
+
+
+@timed('rename')
+def two_phase_rename(renames, folder_path, progress=None, journal_path=None):
+    """Execute renames without clobbering, in dependency order.
+
+    Kept under its original name; files only go through a temporary name when
+    they are part of a rename cycle (see plan_rename_steps). If progress raises
+    (e.g. to cancel), completed steps are rolled back like any other failure.
+    With journal_path, every step is recorded in a write-ahead RenameJournal
+    first, so a killed job can be finished or rolled back by recover_journal.
+    """
+    folder = Path(folder_path)
+    if not isinstance(renames, Sequence):
+        renames = list(renames)
+    pre_steps, chains, post_steps = plan_rename_steps(renames)
+    steps = list(itertools.chain(pre_steps, itertools.chain.from_iterable(chains), post_steps))
+    
+    journal = None
+    if journal_path is not None:
+        from .journal import RenameJournal
+        journal = RenameJournal.create(journal_path, folder, steps)
+    
+    with DirRenamer(folder) as renamer:
+        runner = StepRunner(renamer, steps, journal)
+        try:
+            runner.forward(progress)
+        except Exception:
+            count('rename.failures')
+            # Roll back completed steps in reverse order
+            failures = runner.backward()
+            if journal is not None:
+                journal.finish(runner.position, remove=not failures)
+            raise
+        except BaseException:
+            # Interrupted (e.g. KeyboardInterrupt): leave the journal for recovery
+            if journal is not None:
+                journal.close()
+            raise
+    
+    if journal is not None:
+        journal.finish(runner.position)
+    
+    # Report original and final paths in plan order for logging
+    return _completed_renames(renames, folder)
+
+
+DEFAULT_RENAME_WORKERS = 8
+PARALLEL_MIN_CHAIN = 64  # shortest chain piece worth an extra temp hop
+
+
+def _first_error(futures):
+    """Return the first exception raised by a finished future, if any."""
+    for future in futures:
+        if future.exception() is not None:
+            return future.exception()
+    return None
+
+
+def _run_parallel(pool, func, tasks, window, failed):
+    """Run func over tasks with at most window futures in flight; re-raise the first error."""
+    from concurrent.futures import FIRST_COMPLETED, wait
+    pending = set()
+    error = None
+    for task in tasks:
+        if len(pending) >= window:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            error = _first_error(finished)
+            if error:
+                break
+        pending.add(pool.submit(func, task))
+    if error:
+        failed.set()  # stop the remaining tasks at their next step
+    finished, _ = wait(pending)
+    error = error or _first_error(finished)
+    if error:
+        failed.set()
+        raise error
+
+
+@timed('rename')
+def parallel_rename(renames, folder_path, workers=DEFAULT_RENAME_WORKERS, stats=None):
+    """Execute renames like two_phase_rename, with independent steps on a thread pool.
+
+    Meant for SMB/NFS shares where every rename is a network round trip. Chains
+    keep their order inside one task; long chains are cut (see max_chain in
+    plan_rename_steps) so a single shift job still spreads over all workers. No
+    journal is written: files a failed rollback leaves behind are named in the
+    raised error. If stats is a dict it receives the rename count, elapsed
+    seconds and renames/sec.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    folder = Path(folder_path)
+    if not isinstance(renames, Sequence):
+        renames = list(renames)
+    start = time.perf_counter()
+    max_chain = max(PARALLEL_MIN_CHAIN, len(renames) // (workers * 4) + 1)
+    pre_steps, chains, post_steps = plan_rename_steps(renames, max_chain)
+    
+    done = []
+    failed = threading.Event()
+    
+    with DirRenamer(folder) as renamer, ThreadPoolExecutor(max_workers=workers) as pool:
+        def run_chain(chain):
+            for src, dst in chain:
+                if failed.is_set():
+                    return
+                renamer.rename(src, dst)
+                done.append((src, dst))
+        
+        # Independent temp moves are grouped so each task does a useful amount of work
+        def batches(steps):
+            return (steps[i:i + PARALLEL_MIN_CHAIN] for i in range(0, len(steps), PARALLEL_MIN_CHAIN))
+        
+        try:
+            for tasks in (batches(pre_steps), chains, batches(post_steps)):
+                _run_parallel(pool, run_chain, tasks, workers * 2, failed)
+        except Exception as error:
+            count('rename.failures')
+            # Every task has finished; completion order is a valid order to reverse.
+            # There is no journal, so files left behind are named in the error.
+            stranded = []
+            for src, dst in reversed(done):
+                try:
+                    renamer.rename(dst, src)
+                except OSError:
+                    stranded.append((dst, src))
+            count('rollback.failures', len(stranded))
+            if stranded:
+                raise rollback_error(error, stranded) from error
+            raise
+        finally:
+            count('fs.rename', len(done))
+    
+    if stats is not None:
+        elapsed = time.perf_counter() - start
+        stats['renames'] = len(done)
+        stats['seconds'] = elapsed
+        stats['renames_per_sec'] = len(done) / elapsed if elapsed > 0 else 0.0
+        stats['workers'] = workers
+    
+    return _completed_renames(renames, folder)
@@ -0,0 +1,7 @@
+"""
+Tk user interface. Importing this package imports tkinter.
+"""
+
+from .app import PNGRenamerGUI, main
+from .jobs import JobRunner
+from .widgets import VirtualPreview
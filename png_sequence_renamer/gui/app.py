@@ -0,0 +1,570 @@
+"""
+PNG Sequence Renamer main window.
+"""
+
+import os
+import threading
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from .. import __version__
+from ..analysis import analyze_sequences, format_ranges, summarize_analysis
+from ..executor import two_phase_rename
+from ..instrument import Recorder, recording
+from ..journal import journal_path_for, recover_journal
+from ..log import find_log, undo_from_log, write_log
+from ..session import RenameSession
+from .jobs import JobRunner
+from .widgets import StatsPanel, VirtualPreview
+
+# Wait this long after the last keystroke before re-planning the preview
+PREVIEW_DEBOUNCE_MS = 200
+
+class PNGRenamerGUI:
+    def __init__(self, root):
+        self.root = root
+        self.root.title(f"PNG Sequence Renamer v{__version__}")
+        self.root.geometry("850x650")
+        
+        # Variables
+        self.folder_path = tk.StringVar()
+        self.basename = tk.StringVar(value="frame")
+        self.start_index = tk.IntVar(value=1)
+        self.zero_padding = tk.IntVar(value=0)
+        self.prefix = tk.StringVar()
+        self.suffix = tk.StringVar()
+        self.sort_mode = tk.StringVar(value="Name")
+        self.split_sequences = tk.BooleanVar(value=False)
+        
+        self.current_renames = []
+        self.log_file_path = ""
+        # Scan and sort results, reused while only naming options change
+        self.session = RenameSession()
+        
+        self.setup_ui()
+        self.jobs = JobRunner(self.root, self.status_var)
+        
+        # Live preview: naming option edits re-plan the previewed folder
+        self._live_after = None
+        self._live_pending = False
+        self._live_generation = 0
+        for var in (self.basename, self.start_index, self.zero_padding, self.prefix, self.suffix,
+                    self.split_sequences):
+            var.trace_add('write', self.schedule_live_preview)
+        
+        # Check for updates on startup (optional)
+        self.check_updates_on_startup()
+    
+    def setup_ui(self):
+        """Set up the user interface."""
+        # Main frame
+        main_frame = ttk.Frame(self.root, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # Configure grid weights
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(1, weight=1)
+        main_frame.rowconfigure(7, weight=1)
+        
+        # Title with version
+        title_label = ttk.Label(main_frame, text=f"🖼️ PNG Sequence Renamer v{__version__}", 
+                               font=('Arial', 12, 'bold'))
+        title_label.grid(row=0, column=0, columnspan=3, pady=(0, 10))
+        
+        # Folder selection
+        ttk.Label(main_frame, text="Folder:").grid(row=1, column=0, sticky=tk.W, pady=2)
+        folder_frame = ttk.Frame(main_frame)
+        folder_frame.grid(row=1, column=1, columnspan=2, sticky=(tk.W, tk.E), pady=2)
+        folder_frame.columnconfigure(0, weight=1)
+        
+        ttk.Entry(folder_frame, textvariable=self.folder_path, state='readonly').grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 5))
+        ttk.Button(folder_frame, text="Browse", command=self.browse_folder).grid(row=0, column=1)
+        
+        # Basename (required)
+        ttk.Label(main_frame, text="Basename*:").grid(row=2, column=0, sticky=tk.W, pady=2)
+        ttk.Entry(main_frame, textvariable=self.basename).grid(row=2, column=1, sticky=(tk.W, tk.E), pady=2)
+        
+        # Start index
+        ttk.Label(main_frame, text="Start Index:").grid(row=3, column=0, sticky=tk.W, pady=2)
+        ttk.Entry(main_frame, textvariable=self.start_index, width=10).grid(row=3, column=1, sticky=tk.W, pady=2)
+        
+        # Zero padding
+        ttk.Label(main_frame, text="Zero Padding:").grid(row=4, column=0, sticky=tk.W, pady=2)
+        padding_frame = ttk.Frame(main_frame)
+        padding_frame.grid(row=4, column=1, sticky=tk.W, pady=2)
+        ttk.Entry(padding_frame, textvariable=self.zero_padding, width=10).grid(row=0, column=0)
+        ttk.Label(padding_frame, text="(0 = auto-detect)").grid(row=0, column=1, padx=(5, 0))
+        
+        # Prefix
+        ttk.Label(main_frame, text="Prefix:").grid(row=5, column=0, sticky=tk.W, pady=2)
+        ttk.Entry(main_frame, textvariable=self.prefix).grid(row=5, column=1, sticky=(tk.W, tk.E), pady=2)
+        
+        # Suffix
+        ttk.Label(main_frame, text="Suffix:").grid(row=6, column=0, sticky=tk.W, pady=2)
+        ttk.Entry(main_frame, textvariable=self.suffix).grid(row=6, column=1, sticky=(tk.W, tk.E), pady=2)
+        
+        # Sort mode
+        ttk.Label(main_frame, text="Sort by:").grid(row=7, column=0, sticky=tk.W, pady=2)
+        sort_combo = ttk.Combobox(main_frame, textvariable=self.sort_mode, values=["Name", "Modified", "Created"], state='readonly')
+        sort_combo.grid(row=7, column=1, sticky=tk.W, pady=2)
+        ttk.Checkbutton(main_frame, text="Number each sequence separately",
+                        variable=self.split_sequences).grid(row=7, column=2, sticky=tk.W, pady=2)
+        
+        # Preview area
+        preview_frame = ttk.LabelFrame(main_frame, text="Preview", padding="5")
+        preview_frame.grid(row=8, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(10, 0))
+        preview_frame.columnconfigure(0, weight=1)
+        preview_frame.rowconfigure(0, weight=1)
+        
+        # Virtualized preview table: only the visible rows exist as Treeview items
+        self.preview = VirtualPreview(preview_frame)
+        self.preview.frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # Buttons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=9, column=0, columnspan=3, pady=(10, 0))
+        
+        # Job buttons are disabled while a background job runs; Cancel only then
+        self.job_buttons = [
+            ttk.Button(button_frame, text="Preview", command=self.preview_renames),
+            ttk.Button(button_frame, text="Analyze", command=self.analyze_folder),
+            ttk.Button(button_frame, text="Rename", command=self.execute_renames),
+            ttk.Button(button_frame, text="Undo", command=self.undo_renames),
+        ]
+        for i, button in enumerate(self.job_buttons):
+            button.pack(side=tk.LEFT, padx=(0, 5) if i == 0 else 5)
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", command=self.cancel_job, state='disabled')
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="🔄 Check Updates", command=self.check_for_updates).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Exit", command=self.root.quit).pack(side=tk.RIGHT)
+        
+        # Enhanced status bar with color
+        self.status_var = tk.StringVar(value="🚀 Ready - Select a folder to begin")
+        status_bar = ttk.Label(main_frame, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W, 
+                               background='#E8F4FD', foreground='#2C5282')
+        status_bar.grid(row=10, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(5, 0))
+        
+        # Phase timings and counters of the last job, collapsed by default
+        self.stats_panel = StatsPanel(main_frame)
+        self.stats_panel.frame.grid(row=11, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(5, 0))
+    
+    def browse_folder(self):
+        """Open folder selection dialog."""
+        folder = filedialog.askdirectory()
+        if folder:
+            # The plan names files of the old folder; never run it against the new one
+            self._live_generation += 1
+            self.current_renames = []
+            self.preview.clear()
+            self.folder_path.set(folder)
+            self.status_var.set(f"📂 Selected folder: {os.path.basename(folder)}")
+            if os.path.exists(journal_path_for(folder)):
+                self.recover_interrupted(folder)
+    
+    def recover_interrupted(self, folder):
+        """Offer to finish or roll back a rename job that was interrupted in folder."""
+        answer = messagebox.askyesnocancel(
+            "Interrupted Rename",
+            "A previous rename in this folder was interrupted.\n\n"
+            "Yes: finish the rename\nNo: restore the original names\nCancel: decide later")
+        if answer is None:
+            return
+        
+        mode = "resume" if answer else "rollback"
+        journal_path = journal_path_for(folder)
+        log_file_path = os.path.join(folder, "rename_log.csv")
+        
+        def job(progress):
+            self.session.invalidate()
+            result = recover_journal(journal_path, mode, progress=progress)
+            if mode == "resume":
+                write_log(result['renames'], log_file_path)
+            return result
+        
+        def done(result):
+            if mode == "resume":
+                self.log_file_path = log_file_path
+                self.status_var.set(f"Interrupted rename finished ({result['steps']} steps)")
+            elif result['failures']:
+                self.status_var.set(f"Rollback incomplete: {result['failures']} files could not be restored")
+            else:
+                self.status_var.set("Interrupted rename rolled back - original names restored")
+        
+        self.run_job(job, done, "Recovery failed", "Recovery failed",
+                     "Recovery cancelled - select the folder again to finish it")
+    
+    def set_busy(self, busy):
+        """Enable or disable the job buttons while a background job runs."""
+        for button in self.job_buttons:
+            button.configure(state='disabled' if busy else 'normal')
+        self.cancel_button.configure(state='normal' if busy else 'disabled')
+        if not busy and self._live_pending:
+            self.schedule_live_preview()
+    
+    def run_job(self, func, on_done, failure_title, failure_status, cancel_status):
+        """Run func(progress) on the job runner and restore the buttons afterwards.
+
+        Every job is recorded (see instrument) and its report shown in the stats panel.
+        """
+        recorder = Recorder()
+        
+        def job(progress):
+            with recording(recorder):
+                return func(progress)
+        
+        def done(result):
+            self.set_busy(False)
+            self.stats_panel.show(recorder.report())
+            on_done(result)
+        
+        def error(e):
+            self.set_busy(False)
+            self.stats_panel.show(recorder.report())
+            messagebox.showerror("Error", f"{failure_title}: {e}")
+            self.status_var.set(failure_status)
+        
+        def cancelled():
+            self.set_busy(False)
+            self.stats_panel.show(recorder.report())
+            self.status_var.set(cancel_status)
+        
+        self.set_busy(True)
+        self.jobs.start(job, done, error, cancelled)
+    
+    def cancel_job(self):
+        """Cancel the running background job."""
+        self.jobs.cancel()
+    
+    def schedule_live_preview(self, *args):
+        """Debounce edits to the naming options into one live_preview call."""
+        if self._live_after is not None:
+            self.root.after_cancel(self._live_after)
+        self._live_after = self.root.after(PREVIEW_DEBOUNCE_MS, self.live_preview)
+    
+    def live_preview(self):
+        """Re-plan the previewed folder with the current naming options.
+
+        Only works from the scan cached by Preview: the plan is built instantly
+        and the table formats just the visible rows, while the collision check
+        for the new template runs on a thread. Rename stays unavailable until
+        that check passes.
+        """
+        self._live_after = None
+        if self.jobs.busy:
+            self._live_pending = True  # Re-run when the job finishes
+            return
+        self._live_pending = False
+        
+        folder = self.folder_path.get()
+        if not self.session.is_current(folder, self.sort_mode.get()):
+            return  # Nothing previewed yet, or the folder changed: needs Preview
+        
+        try:
+            options = (self.basename.get().strip(), self.start_index.get(), self.zero_padding.get(),
+                       self.prefix.get(), self.suffix.get(), self.split_sequences.get())
+        except tk.TclError:
+            return  # Number field is half typed
+        
+        self._live_generation += 1
+        generation = self._live_generation
+        self.current_renames = []
+        if not options[0]:
+            self.preview.clear()
+            self.status_var.set("Basename is required")
+            return
+        
+        if options[-1] and not self.session.has_sequences():
+            # Grouping reads every file name once; do it as a job, not here
+            self.preview_renames()
+            return
+        
+        renames = self.session.build(*options)
+        self.preview.set_rows(renames, keep_offset=True)
+        self.status_var.set(f"Checking {len(renames)} new names for collisions...")
+        
+        session = self.session
+        
+        def check():
+            _, collisions = session.plan(*options)
+            self.root.after(0, lambda: self.live_checked(generation, renames, collisions))
+        
+        threading.Thread(target=check, daemon=True).start()
+    
+    def live_checked(self, generation, renames, collisions):
+        """Apply a live collision check unless the options have changed since."""
+        if generation != self._live_generation:
+            return
+        if collisions:
+            more = f" (+{len(collisions) - 1} more)" if len(collisions) > 1 else ""
+            self.status_var.set(f"⚠️ {collisions[0]}{more}")
+            return
+        self.current_renames = renames
+        self.status_var.set(f"✅ Preview ready: {len(renames)} files to rename")
+    
+    def preview_renames(self):
+        """Preview the planned renames."""
+        # Clear previous preview
+        self.preview.clear()
+        self.current_renames = []
+        self._live_generation += 1
+        
+        if not self.folder_path.get():
+            messagebox.showerror("Error", "Please select a folder first.")
+            return
+        
+        if not self.basename.get().strip():
+            messagebox.showerror("Error", "Basename is required.")
+            return
+        
+        # Read the Tk variables here; the job runs on a worker thread
+        try:
+            folder = self.folder_path.get()
+            sort_mode = self.sort_mode.get()
+            options = (self.basename.get().strip(), self.start_index.get(), self.zero_padding.get(),
+                       self.prefix.get(), self.suffix.get(), self.split_sequences.get())
+        except Exception as e:
+            messagebox.showerror("Error", f"Preview failed: {e}")
+            self.status_var.set("Preview failed")
+            return
+        
+        def job(progress):
+            # Scan only if the folder, sort mode or folder contents changed
+            if not self.session.scan(folder, sort_mode, progress=progress):
+                return [], []
+            
+            # Plan renames and check for collisions against the cached listing
+            return self.session.plan(*options)
+        
+        def done(result):
+            renames, collisions = result
+            if not renames:
+                self.status_var.set("⚠️ No PNG files found in selected folder.")
+                return
+            
+            if collisions:
+                collision_msg = "Naming collisions detected:\n\n" + "\n".join(collisions[:10])
+                if len(collisions) > 10:
+                    collision_msg += f"\n... and {len(collisions) - 10} more"
+                messagebox.showerror("Collision Error", collision_msg)
+                self.status_var.set("Preview failed")
+                return
+            
+            # Show the plan; rows are rendered on demand as the user scrolls
+            self.current_renames = renames
+            self.preview.set_rows(self.current_renames)
+            
+            self.status_var.set(f"✅ Preview ready: {len(self.current_renames)} files to rename")
+        
+        self.run_job(job, done, "Preview failed", "Preview failed", "Preview cancelled")
+    
+    def analyze_folder(self):
+        """Report missing and duplicate frames of the folder's sequences in the status bar."""
+        folder = self.folder_path.get()
+        if not folder:
+            messagebox.showerror("Error", "Please select a folder first.")
+            return
+        sort_mode = self.sort_mode.get()
+        
+        def job(progress):
+            # Shares the scan (and grouping) with Preview
+            if not self.session.scan(folder, sort_mode, progress=progress):
+                return None
+            return analyze_sequences(*self.session.sequences())
+        
+        def done(report):
+            if report is None:
+                self.status_var.set("⚠️ No PNG files found in selected folder.")
+                return
+            
+            summary = summarize_analysis(report)
+            lines = []
+            for result in report['sequences']:
+                if result['missing']:
+                    lines.append(f"{result['sequence']}: missing {format_ranges(result['missing'])}")
+                for duplicate in result['duplicates']:
+                    lines.append(f"{result['sequence']}: frame {duplicate['frame']} in {', '.join(duplicate['files'])}")
+            lines.extend(f"Out of pattern: {name}" for name in report['out_of_pattern'])
+            if not lines:
+                self.status_var.set(f"✅ {summary}")
+                return
+            
+            self.status_var.set(f"⚠️ {summary}")
+            details = "\n".join(lines[:10])
+            if len(lines) > 10:
+                details += f"\n... and {len(lines) - 10} more"
+            messagebox.showwarning("Sequence Analysis", f"{summary}\n\n{details}")
+        
+        self.run_job(job, done, "Analysis failed", "Analysis failed", "Analysis cancelled")
+    
+    def execute_renames(self):
+        """Execute the planned renames."""
+        if not self.current_renames:
+            messagebox.showwarning("Warning", "No renames planned. Click Preview first.")
+            return
+        
+        folder = self.folder_path.get()
+        if self.session.folder != folder:
+            # Renames go by file name within the folder, so a plan only fits the folder it was made for
+            self.current_renames = []
+            self.preview.clear()
+            messagebox.showwarning("Warning", "The folder changed since the preview. Click Preview again.")
+            return
+        
+        # Confirm with user
+        if not messagebox.askyesno("Confirm Rename", 
+                                   f"Are you sure you want to rename {len(self.current_renames)} files?"):
+            return
+        
+        renames = self.current_renames
+        log_file_path = os.path.join(folder, "rename_log.csv")
+        
+        def job(progress):
+            self.session.invalidate()
+            # Execute rename, then write log file
+            completed_renames = two_phase_rename(renames, folder, progress=progress,
+                                                 journal_path=journal_path_for(folder))
+            write_log(completed_renames, log_file_path)
+            return completed_renames
+        
+        def done(completed_renames):
+            self.log_file_path = log_file_path
+            
+            # Clear preview
+            self.preview.clear()
+            
+            self.current_renames = []
+            self.status_var.set(f"🎉 Successfully renamed {len(completed_renames)} files")
+            
+            messagebox.showinfo("Success", f"Renamed {len(completed_renames)} files successfully!\nLog saved to: rename_log.csv")
+        
+        self.run_job(job, done, "Rename failed", "Rename failed",
+                     "Rename cancelled - all files restored to their original names")
+    
+    def undo_renames(self):
+        """Undo the last rename operation."""
+        log_path = find_log(self.folder_path.get() if self.folder_path.get() else "")
+        
+        if not os.path.exists(log_path):
+            messagebox.showwarning("Warning", "No undo log found. Cannot undo.")
+            return
+        
+        if not messagebox.askyesno("Confirm Undo", "Are you sure you want to undo the last rename operation?"):
+            return
+        
+        def done(undone_files):
+            self.status_var.set(f"Undone {len(undone_files)} renames")
+            messagebox.showinfo("Success", f"Successfully undone {len(undone_files)} renames")
+        
+        def job(progress):
+            self.session.invalidate()
+            return undo_from_log(log_path, progress=progress)
+        
+        self.run_job(job, done,
+                     "Undo failed", "Undo failed", "Undo cancelled - the log was kept, run Undo again to finish")
+    
+    def check_updates_on_startup(self):
+        """Check for updates when the app starts (non-blocking)."""
+        def check():
+            try:
+                # Imported here so the network modules load off the UI thread
+                from ..updater import UpdateChecker
+                update_info = UpdateChecker.check_for_updates()
+                if update_info.get('available'):
+                    self.root.after(0, lambda: self.show_update_notification(update_info))
+            except:
+                pass  # Silently fail on startup check
+        
+        thread = threading.Thread(target=check, daemon=True)
+        thread.start()
+    
+    def check_for_updates(self):
+        """Manual update check triggered by button."""
+        self.status_var.set("🔍 Checking for updates...")
+        
+        def check():
+            try:
+                # Imported here so the network modules load off the UI thread
+                from ..updater import UpdateChecker
+                update_info = UpdateChecker.check_for_updates()
+                self.root.after(0, lambda: self.handle_update_result(update_info))
+            except Exception as e:
+                self.root.after(0, lambda: self.status_var.set(f"❌ Update check failed: {e}"))
+        
+        thread = threading.Thread(target=check, daemon=True)
+        thread.start()
+    
+    def handle_update_result(self, update_info):
+        """Handle the result of update check."""
+        if update_info.get('available'):
+            self.show_update_notification(update_info)
+        elif update_info.get('error'):
+            self.status_var.set(f"❌ Update check failed: {update_info['error']}")
+        else:
+            self.status_var.set("✅ You have the latest version!")
+            messagebox.showinfo("Up to Date", "You're already using the latest version!")
+    
+    def show_update_notification(self, update_info):
+        """Show update notification dialog."""
+        message = (f"🎉 New version available!\n\n"
+                  f"Current version: {__version__}\n"
+                  f"Latest version: {update_info['version']}\n\n"
+                  f"Release notes:\n{update_info['release_notes'][:200]}...\n\n"
+                  f"Would you like to download the update?")
+        
+        if messagebox.askyesno("Update Available", message):
+            self.download_update(update_info['download_url'])
+    
+    def download_update(self, download_url):
+        """Download and install update."""
+        progress_window = tk.Toplevel(self.root)
+        progress_window.title("Downloading Update")
+        progress_window.geometry("400x100")
+        progress_window.resizable(False, False)
+        
+        ttk.Label(progress_window, text="Downloading update...").pack(pady=10)
+        progress_bar = ttk.Progressbar(progress_window, mode='determinate')
+        progress_bar.pack(fill=tk.X, padx=20, pady=10)
+        
+        def progress_callback(percent):
+            progress_bar['value'] = percent
+            progress_window.update()
+        
+        def download():
+            try:
+                from ..updater import UpdateChecker
+                temp_file = UpdateChecker.download_update(download_url, progress_callback)
+                self.root.after(0, lambda: self.install_update(temp_file, progress_window))
+            except Exception as e:
+                self.root.after(0, lambda: messagebox.showerror("Download Failed", f"Failed to download update: {e}"))
+                progress_window.destroy()
+        
+        thread = threading.Thread(target=download, daemon=True)
+        thread.start()
+    
+    def install_update(self, update_file, progress_window):
+        """Install the downloaded update."""
+        progress_window.destroy()
+        
+        message = (f"Update downloaded successfully!\n\n"
+                  f"The new version has been saved to:\n{update_file}\n\n"
+                  f"Please close this application and run the new version.")
+        
+        messagebox.showinfo("Update Ready", message)
+        
+        # Optionally, try to open the file location
+        try:
+            if os.name == 'nt':  # Windows
+                os.startfile(os.path.dirname(update_file))
+            elif os.name == 'posix':  # macOS/Linux
+                os.system(f'open "{os.path.dirname(update_file)}"')
+        except:
+            pass
+
+
+def main():
+    """Main entry point for the GUI application."""
+    root = tk.Tk()
+    app = PNGRenamerGUI(root)
+    root.mainloop()
+    return 0
@@ -0,0 +1,111 @@
+"""
+Background job runner that keeps the Tk main loop responsive.
+"""
+
+import queue
+import threading
+import time
+
+from ..progress import JobCancelled
+
+class JobRunner:
+    """Run one long job at a time on a worker thread, reporting back on the Tk main loop.
+
+    The job function is called with a progress(phase, done, total) callback.
+    Progress and results are queued by the worker and drained by a root.after
+    poll, so Tk is only touched from the main thread. cancel() makes the next
+    progress call raise JobCancelled inside the job, which lets the rename
+    executors roll back before the job ends.
+    """
+    
+    POLL_MS = 100
+    
+    def __init__(self, root, status_var):
+        self.root = root
+        self.status_var = status_var
+        self._queue = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread = None
+        self._callbacks = None
+        self._phase = None
+        self._phase_start = 0.0
+    
+    @property
+    def busy(self):
+        """True while a job is running."""
+        return self._thread is not None
+    
+    def start(self, func, on_done, on_error, on_cancel=None):
+        """Run func(progress) in the background; the callbacks run on the main thread."""
+        if self.busy:
+            raise RuntimeError("Another job is still running")
+        
+        self._cancel.clear()
+        self._callbacks = (on_done, on_error, on_cancel)
+        self._phase = None
+        
+        def work():
+            try:
+                self._queue.put(('done', func(self._progress)))
+            except JobCancelled:
+                self._queue.put(('cancelled', None))
+            except Exception as e:
+                self._queue.put(('error', e))
+        
+        self._thread = threading.Thread(target=work, daemon=True)
+        self._thread.start()
+        self.root.after(self.POLL_MS, self._poll)
+    
+    def cancel(self):
+        """Ask the running job to stop at its next progress report."""
+        if self.busy:
+            self._cancel.set()
+            self.status_var.set("⏹️ Cancelling...")
+    
+    def _progress(self, phase, done, total=None):
+        # Runs on the worker thread
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self._queue.put(('progress', (phase, done, total)))
+    
+    def _poll(self):
+        latest = None
+        while True:
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                latest = payload
+                continue
+            
+            # The job has finished
+            self._thread = None
+            on_done, on_error, on_cancel = self._callbacks
+            if kind == 'done':
+                on_done(payload)
+            elif kind == 'error':
+                on_error(payload)
+            elif on_cancel is not None:
+                on_cancel()
+            return
+        
+        if latest is not None and not self._cancel.is_set():
+            self.status_var.set(self._format_progress(*latest))
+        self.root.after(self.POLL_MS, self._poll)
+    
+    def _format_progress(self, phase, done, total):
+        now = time.perf_counter()
+        if phase != self._phase:
+            self._phase = phase
+            self._phase_start = now
+        
+        if not total:
+            return f"⏳ {phase}: {done:,}"
+        
+        text = f"⏳ {phase}: {done:,}/{total:,} ({done * 100 // total}%)"
+        elapsed = now - self._phase_start
+        if done and elapsed > 0.5:
+            remaining = (total - done) * elapsed / done
+            text += f" - ETA {int(remaining) // 60}:{int(remaining) % 60:02d}"
+        return text
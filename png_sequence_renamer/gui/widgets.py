@@ -0,0 +1,196 @@
+"""
+Tk widgets used by the main window.
+"""
+
+import os
+import tkinter as tk
+from tkinter import ttk
+
+class VirtualPreview:
+    """Preview table that only creates Treeview rows for the visible viewport.
+
+    rows can be any sequence of (old_path, new_name) pairs. The Treeview holds a
+    fixed number of items (the viewport plus a small margin) whose values are
+    refilled from rows as the user scrolls, so showing a plan costs the same at
+    any folder size.
+    """
+    
+    MARGIN = 2
+    
+    def __init__(self, parent):
+        self.frame = ttk.Frame(parent)
+        self.frame.columnconfigure(0, weight=1)
+        self.frame.rowconfigure(0, weight=1)
+        
+        self.rows = []
+        self.offset = 0
+        self.visible = 10
+        self.row_height = self._row_height()
+        
+        # Treeview for preview with enhanced styling
+        self.tree = ttk.Treeview(self.frame, columns=('old', 'new'), show='headings', height=10)
+        self.tree.heading('old', text='🔴 Current Name')
+        self.tree.heading('new', text='🟢 New Name')
+        self.tree.column('old', width=350, anchor='w')
+        self.tree.column('new', width=350, anchor='w')
+        
+        # Configure colorful tags for the treeview
+        self.tree.tag_configure('old_file', background='#FFE6E6', foreground='#8B0000')
+        self.tree.tag_configure('new_file', background='#E6FFE6', foreground='#006400')
+        self.tree.tag_configure('alternate', background='#F0F0F0')
+        
+        # The vertical scrollbar tracks the position in rows, not in the Treeview
+        self.v_scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        h_scrollbar = ttk.Scrollbar(self.frame, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(xscrollcommand=h_scrollbar.set)
+        
+        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.v_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        h_scrollbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', self._on_wheel)
+        self.tree.bind('<Button-4>', lambda e: self._scroll_units(-3))
+        self.tree.bind('<Button-5>', lambda e: self._scroll_units(3))
+        self.tree.bind('<Up>', lambda e: self._scroll_units(-1))
+        self.tree.bind('<Down>', lambda e: self._scroll_units(1))
+        self.tree.bind('<Prior>', lambda e: self._scroll_units(-self.visible))
+        self.tree.bind('<Next>', lambda e: self._scroll_units(self.visible))
+        self.tree.bind('<Home>', lambda e: self.scroll_to(0) or 'break')
+        self.tree.bind('<End>', lambda e: self.scroll_to(len(self.rows)) or 'break')
+        
+        self.refresh()
+    
+    @staticmethod
+    def _row_height():
+        """Pixel height of one Treeview row for the current theme."""
+        style = ttk.Style()
+        height = style.lookup('Treeview', 'rowheight')
+        try:
+            return max(1, int(height))
+        except (TypeError, ValueError):
+            return 20
+    
+    def set_rows(self, rows, keep_offset=False):
+        """Show a new sequence of (old_path, new_name) rows, from the top unless keep_offset."""
+        self.rows = rows
+        self.offset = max(0, min(self.offset, len(rows) - self.visible)) if keep_offset else 0
+        self.refresh()
+    
+    def clear(self):
+        """Remove all rows."""
+        self.set_rows([])
+    
+    def scroll_to(self, offset):
+        """Make row offset the first visible row (clamped to the valid range)."""
+        offset = max(0, min(offset, len(self.rows) - self.visible))
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+    
+    def refresh(self):
+        """Refill the Treeview items from rows[offset:offset + visible + MARGIN]."""
+        total = len(self.rows)
+        count = max(0, min(self.visible + self.MARGIN, total - self.offset))
+        
+        # Keep exactly `count` items; they are reused rather than recreated
+        items = self.tree.get_children()
+        for item in items[count:]:
+            self.tree.delete(item)
+        for _ in range(len(items), count):
+            self.tree.insert('', 'end')
+        
+        for slot, item in enumerate(self.tree.get_children()):
+            i = self.offset + slot
+            old_path, new_name = self.rows[i]
+            
+            # Determine row styling
+            tag = 'even_row' if i % 2 == 0 else 'odd_row'
+            
+            # Enhanced formatting
+            old_display = f"📄 {os.path.basename(old_path)}"
+            new_display = f"✨ {new_name}"
+            self.tree.item(item, values=(old_display, new_display), tags=(tag,))
+        
+        self.tree.yview_moveto(0)
+        if total:
+            self.v_scrollbar.set(self.offset / total, min(1.0, (self.offset + self.visible) / total))
+        else:
+            self.v_scrollbar.set(0.0, 1.0)
+    
+    def _on_resize(self, event):
+        # Leave room for the heading row
+        visible = max(1, (event.height - self.row_height) // self.row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.offset = max(0, min(self.offset, len(self.rows) - visible))
+            self.refresh()
+    
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(value) * len(self.rows)))
+        elif action == 'scroll':
+            step = int(value) * (self.visible if unit == 'pages' else 1)
+            self.scroll_to(self.offset + step)
+    
+    def _on_wheel(self, event):
+        # Windows reports multiples of 120, macOS small deltas
+        self._scroll_units(-3 if event.delta > 0 else 3)
+        return 'break'
+    
+    def _scroll_units(self, units):
+        self.scroll_to(self.offset + units)
+        return 'break'
+
+
+class StatsPanel:
+    """Collapsible table of the phase timings and counters of the last job.
+
+    A toggle button shows or hides the table; the one-line summary next to it
+    is always visible. show() takes an instrument Recorder report.
+    """
+    
+    def __init__(self, parent):
+        self.frame = ttk.Frame(parent)
+        self.frame.columnconfigure(1, weight=1)
+        self.expanded = False
+        
+        self.toggle_button = ttk.Button(self.frame, text="▸ Stats", width=8, command=self.toggle)
+        self.toggle_button.grid(row=0, column=0, sticky=tk.W)
+        self.summary_var = tk.StringVar(value="No job timed yet")
+        ttk.Label(self.frame, textvariable=self.summary_var).grid(row=0, column=1, sticky=tk.W, padx=(5, 0))
+        
+        # Phases and counters as two branches; created now, gridded when expanded
+        self.tree = ttk.Treeview(self.frame, columns=('value', 'calls'), height=8)
+        self.tree.heading('#0', text='Phase / counter')
+        self.tree.heading('value', text='Time / count')
+        self.tree.heading('calls', text='Calls')
+        self.tree.column('#0', width=250, anchor='w')
+        self.tree.column('value', width=150, anchor='e')
+        self.tree.column('calls', width=80, anchor='e')
+    
+    def toggle(self):
+        """Show or hide the table."""
+        self.expanded = not self.expanded
+        if self.expanded:
+            self.tree.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 0))
+        else:
+            self.tree.grid_remove()
+        self.toggle_button.configure(text="▾ Stats" if self.expanded else "▸ Stats")
+    
+    def show(self, report):
+        """Replace the table with a report, slowest phase first."""
+        self.tree.delete(*self.tree.get_children())
+        phases = self.tree.insert('', 'end', text="Phases", open=True)
+        for name, phase in sorted(report['phases'].items(), key=lambda item: -item[1]['seconds']):
+            self.tree.insert(phases, 'end', text=name,
+                             values=(f"{phase['seconds'] * 1000:.1f} ms", phase['calls']))
+        counters = self.tree.insert('', 'end', text="Counters", open=True)
+        for name, amount in report['counters'].items():
+            self.tree.insert(counters, 'end', text=name, values=(f"{amount:,}", ""))
+        
+        slowest = max(report['phases'].items(), key=lambda item: item[1]['seconds'], default=None)
+        summary = f"Last job: {report['seconds'] * 1000:.0f} ms"
+        if slowest is not None:
+            summary += f", mostly {slowest[0]} ({slowest[1]['seconds'] * 1000:.0f} ms)"
+        self.summary_var.set(summary)
@@ -0,0 +1,218 @@
+"""
+Persistent folder index
+
+cached_scan returns what scan_folder returns, but keeps the result in a small
+file in the user's cache directory. The index is keyed by the folder's device,
+inode and modification time: while those match, reopening the folder in "Name"
+order costs one stat() call however many files it holds. When the folder has
+changed, it is listed again and the sort starts from the indexed order.
+
+The folder's modification time says nothing about file contents: a frame
+re-rendered in place, or replaced through a temporary file, keeps its name.
+So the "Modified" and "Created" orders never come from the index alone; every
+file is listed and stat'ed again, and the index only gives the sort a mostly
+sorted start.
+
+Index file: INDEX_MAGIC, a fixed header (_HEADER) and a zlib stream holding
+the folder path, the sort mode and every entry name (PNG files first, in sort
+order), NUL-separated.
+"""
+
+import os
+import struct
+import sys
+import time
+import zlib
+
+from .instrument import count, phase, timed
+from .scanner import ScanEntry, entry_sort_key, iter_png_entries, scan_folder
+from .sorting import FrameIndex
+
+INDEX_MAGIC = b"PNGSEQIDX\n"
+INDEX_VERSION = 2
+# version, st_dev, st_ino, st_mtime_ns, written_ns, png_count, text_len
+_HEADER = struct.Struct('<HQQqqQQ')
+# A folder changed this close to the index being written may have changed
+# within one timestamp tick (2 s on FAT/SMB), so its mtime is not trusted
+RACY_WINDOW_NS = 2 * 10 ** 9
+# Index files kept in the cache folder; the least recently written go first
+MAX_INDEX_FILES = 256
+
+
+def default_cache_dir():
+    """Return the per-user folder for index files (XDG cache dir on Linux)."""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser(r"~\AppData\Local")
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser("~/.cache")
+    return os.path.join(base, "png-sequence-renamer", "index")
+
+
+def index_path_for(folder_path, cache_dir=None):
+    """Return the index file used for folder."""
+    folder = os.path.abspath(folder_path)
+    key = zlib.crc32(os.fsencode(folder))
+    # The full path is stored inside, so a crc32 clash only costs a rescan
+    return os.path.join(cache_dir or default_cache_dir(), f"{key:08x}.idx")
+
+
+def read_index(path):
+    """Load an index file and return it as a dict, or None if it is missing or unreadable.
+
+    Keys: folder, dev, ino, mtime_ns, written_ns, sort_mode, names (PNG files
+    first) and png_count.
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if not data.startswith(INDEX_MAGIC):
+        return None
+    try:
+        (version, dev, ino, mtime_ns, written_ns, png_count,
+         text_len) = _HEADER.unpack_from(data, len(INDEX_MAGIC))
+        if version != INDEX_VERSION:
+            return None
+        payload = zlib.decompress(data[len(INDEX_MAGIC) + _HEADER.size:])
+    except (struct.error, zlib.error):
+        return None
+    
+    fields = payload[:text_len].decode('utf-8', 'surrogateescape').split('\0')
+    return {'folder': fields[0], 'sort_mode': fields[1], 'names': fields[2:], 'png_count': png_count,
+            'dev': dev, 'ino': ino, 'mtime_ns': mtime_ns, 'written_ns': written_ns}
+
+
+def _prune_cache(cache_dir):
+    """Delete the oldest index files beyond MAX_INDEX_FILES."""
+    try:
+        with os.scandir(cache_dir) as it:
+            files = [(entry.stat().st_mtime_ns, entry.path) for entry in it if entry.name.endswith('.idx')]
+    except OSError:
+        return
+    files.sort()
+    for _, path in files[:len(files) - MAX_INDEX_FILES]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def write_index(path, folder_path, folder_stat, sort_mode, entries, listing):
+    """Write the index of a scanned folder; failures are ignored, the index is only a cache."""
+    names = [entry.name for entry in entries]
+    png_names = set(names)
+    names.extend(name for name in listing if name not in png_names)
+    text = '\0'.join([os.path.abspath(folder_path), sort_mode] + names).encode('utf-8', 'surrogateescape')
+    
+    try:
+        header = _HEADER.pack(INDEX_VERSION, folder_stat.st_dev, folder_stat.st_ino,
+                              folder_stat.st_mtime_ns, time.time_ns(), len(entries), len(text))
+        cache_dir = os.path.dirname(path)
+        os.makedirs(cache_dir, exist_ok=True)
+        new = not os.path.exists(path)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(INDEX_MAGIC)
+            f.write(header)
+            compressor = zlib.compressobj(1)
+            f.write(compressor.compress(text))
+            f.write(compressor.flush())
+            count('index.bytes', f.tell())
+        os.replace(temp_path, path)
+    except (OSError, struct.error):
+        return
+    if new:
+        _prune_cache(cache_dir)
+
+
+def _sort_entries(entries, sort_mode):
+    """Sort ScanEntry records in memory exactly like scan_folder does."""
+    with phase('sort'):
+        if sort_mode == "Name":
+            order = FrameIndex([entry.name for entry in entries]).order()
+            return [entries[i] for i in order]
+        key = entry_sort_key(sort_mode)
+        if key is not None:
+            entries.sort(key=key)
+        return entries
+
+
+@timed('index')
+def cached_scan(folder_path, sort_mode, listing=None, progress=None, cache_dir=None, refresh=False):
+    """scan_folder with a persistent index: same result, far fewer filesystem calls.
+
+    - "Name" order and the index matches the folder: no listing, no stat()
+      of any file;
+    - folder changed, or "Modified"/"Created" order: one listing (with a
+      stat() per file for those orders, see the module docstring), then a
+      sort that starts from the indexed order;
+    - no usable index (or refresh): a plain scan_folder.
+    The index is rewritten whenever it was not an exact match.
+    """
+    folder_stat = os.stat(folder_path)
+    count('fs.stat')
+    path = index_path_for(folder_path, cache_dir)
+    index = None if refresh else read_index(path)
+    if index is not None and (index['folder'] != os.path.abspath(folder_path)
+                              or (index['dev'], index['ino']) != (folder_stat.st_dev, folder_stat.st_ino)):
+        index = None
+    with_stat = sort_mode in ("Modified", "Created")
+    
+    if index is None:
+        count('index.misses')
+        names = set()
+        entries = scan_folder(folder_path, sort_mode, listing=names, progress=progress)
+        write_index(path, folder_path, folder_stat, sort_mode, entries, names)
+        if listing is not None:
+            listing.update(names)
+        return entries
+    
+    folder = os.fspath(folder_path)
+    png_count = index['png_count']
+    # A folder mtime match proves the names, not the file times
+    unchanged = (not with_stat and index['mtime_ns'] == folder_stat.st_mtime_ns
+                 and folder_stat.st_mtime_ns < index['written_ns'] - RACY_WINDOW_NS)
+    
+    if unchanged:
+        count('index.hits')
+        names = index['names']
+        prefix = os.path.join(folder, '')
+        rewrite = index['sort_mode'] != sort_mode
+        entries = [ScanEntry(name, prefix + name, None) for name in names[:png_count]]
+        if listing is not None:
+            listing.update(names)
+        count('scan.files', png_count)
+        if rewrite:
+            entries = _sort_entries(entries, sort_mode)
+            write_index(path, folder_path, folder_stat, sort_mode, entries, names)
+        return entries
+    
+    # Changed folder (or stat data needed): list it, keep the indexed order
+    count('index.updates')
+    found = {}
+    names = set()
+    for entry in iter_png_entries(folder_path, with_stat, listing=names):
+        found[entry.name] = entry
+    if with_stat:
+        count('fs.stat', len(found))
+    
+    # Files still present go first, in their indexed order, so the sort below
+    # starts from a mostly sorted list (and FrameIndex samples the old frames)
+    entries = []
+    for name in index['names'][:png_count]:
+        entry = found.pop(name, None)
+        if entry is not None:
+            entries.append(entry)
+    entries.extend(found.values())
+    
+    if progress is not None:
+        progress("Sorting", 0, len(entries))
+    entries = _sort_entries(entries, sort_mode)
+    write_index(path, folder_path, folder_stat, sort_mode, entries, names)
+    if listing is not None:
+        listing.update(names)
+    count('scan.files', len(entries))
+    return entries
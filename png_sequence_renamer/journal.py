@@ -0,0 +1,243 @@
+"""
+Write-ahead rename journal.
+
+Before the first rename, the executor writes every planned step to an
+append-only journal in the folder. Steps then run in batches: a "begin" record
+is fsynced before each batch and a "commit" record is appended after it (made
+durable by the next begin's fsync, i.e. group commit). If the process dies, the
+journal says exactly which steps are done, and only the steps of the last
+uncommitted batch need a check on disk. recover_journal then finishes or rolls
+back the job without rescanning the folder.
+
+Each line is a JSON array:
+    ["job", version, folder, timestamp, step_count]
+    ["step", src_name, dst_name]          one per step, in execution order
+    ["begin", from_position, to_position] to < from when rolling back
+    ["commit", position]
+    ["end", position]
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+from .instrument import count, timed
+
+JOURNAL_NAME = "rename_journal.log"
+JOURNAL_VERSION = 1
+JOURNAL_BATCH = 1000
+
+
+def journal_path_for(folder_path):
+    """Return the journal path used for folder."""
+    return os.path.join(folder_path, JOURNAL_NAME)
+
+
+def _fsync_dir(folder_path):
+    """Make a new directory entry durable where the platform allows it."""
+    try:
+        fd = os.open(folder_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+        count('fs.fsync')
+    except OSError:
+        pass  # Not supported for directories on Windows
+    finally:
+        os.close(fd)
+
+
+class RenameJournal:
+    """Append-only journal for one rename job (see the module docstring)."""
+    
+    def __init__(self, path, f):
+        self.path = path
+        self._file = f
+        self._start = f.tell()  # Journal bytes already there (recovery appends)
+    
+    @classmethod
+    def create(cls, path, folder_path, steps):
+        """Create the journal and durably record every step before any rename.
+
+        Raises FileExistsError if an interrupted job's journal is still present.
+        """
+        f = open(path, 'x', encoding='utf-8')
+        journal = cls(path, f)
+        write = f.write
+        write(json.dumps(["job", JOURNAL_VERSION, os.path.abspath(folder_path),
+                          datetime.now().isoformat(), len(steps)]) + "\n")
+        for src, dst in steps:
+            write(json.dumps(["step", src, dst]) + "\n")
+        journal.sync()
+        _fsync_dir(folder_path)
+        return journal
+    
+    def sync(self):
+        """Flush and fsync everything written so far."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        count('fs.fsync')
+    
+    def begin(self, start, stop):
+        """Record the intent to move from position start to stop, durably."""
+        self._file.write(json.dumps(["begin", start, stop]) + "\n")
+        self.sync()
+    
+    def commit(self, position):
+        """Record that position has been reached (durable with the next sync)."""
+        self._file.write(json.dumps(["commit", position]) + "\n")
+    
+    def finish(self, position, remove=True):
+        """Record the final position and close; remove the journal unless asked not to."""
+        self._file.write(json.dumps(["end", position]) + "\n")
+        self.sync()
+        self.close()
+        if remove:
+            os.remove(self.path)
+    
+    def close(self):
+        """Close without recording anything, leaving the journal for recovery."""
+        count('journal.bytes', self._file.tell() - self._start)
+        self._file.close()
+
+
+def read_journal(path):
+    """Parse a journal and return a dict describing the interrupted job.
+
+    Keys: folder, steps, position (last committed position), pending (the
+    (from, to) of a begun but uncommitted batch, or None) and finished.
+    """
+    folder = None
+    steps = []
+    position = 0
+    pending = None
+    finished = False
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break  # Torn final line from a crash mid-write
+            kind = record[0]
+            if kind == "step":
+                steps.append((record[1], record[2]))
+            elif kind == "begin":
+                pending = (record[1], record[2])
+            elif kind == "commit":
+                position = record[1]
+                pending = None
+            elif kind == "end":
+                position = record[1]
+                pending = None
+                finished = True
+            elif kind == "job":
+                if record[1] != JOURNAL_VERSION:
+                    raise ValueError(f"Unsupported journal version: {record[1]}")
+                folder = record[2]
+    
+    if folder is None:
+        raise ValueError("Journal has no job header")
+    return {'folder': folder, 'steps': steps, 'position': position,
+            'pending': pending, 'finished': finished}
+
+
+def original_renames(steps):
+    """Collapse rename steps (including temp hops) into (old_name, new_name) pairs."""
+    origin = {}
+    for src, dst in steps:
+        origin[dst] = origin.pop(src, src)
+    return [(old_name, new_name) for new_name, old_name in origin.items() if old_name != new_name]
+
+
+def _settle_pending(renamer, steps, pending):
+    """Work out how far an uncommitted batch got by checking only its names on disk.
+
+    Replays the batch on the expected presence of every name it touches and
+    stops at the first state that matches the folder. StepRunner keeps all
+    states of a batch distinct, so that match is the only one.
+    """
+    from .planner import CASE_INSENSITIVE_FS
+    
+    start, stop = pending
+    if stop >= start:
+        moves = [steps[i] for i in range(start, stop)]
+    else:
+        # Rollback batch: steps are reverted from the top down
+        moves = [(dst, src) for src, dst in reversed(steps[stop:start])]
+    key = str.casefold if CASE_INSENSITIVE_FS else str
+    
+    # Before the batch, a name is present if its first move takes from it
+    expected = {}
+    names = {}
+    for src, dst in moves:
+        expected.setdefault(key(src), True)
+        names.setdefault(key(src), src)
+        expected.setdefault(key(dst), False)
+        names.setdefault(key(dst), dst)
+    actual = {name: renamer.exists(names[name]) for name in expected}
+    mismatches = sum(expected[name] != actual[name] for name in expected)
+    
+    done = 0
+    for src, dst in moves:
+        if not mismatches:
+            break
+        for name, present in ((key(src), False), (key(dst), True)):
+            mismatches -= expected[name] != actual[name]
+            expected[name] = present
+            mismatches += expected[name] != actual[name]
+        done += 1
+    
+    if mismatches:
+        raise ValueError("Folder no longer matches the rename journal; recover it by hand")
+    return start + done if stop >= start else start - done
+
+
+@timed('recover')
+def recover_journal(path, mode="rollback", progress=None):
+    """Finish ("resume") or undo ("rollback") the job recorded in an interrupted journal.
+
+    Returns a dict with the mode, the step position found, the step count and,
+    for resume, the (old_path, new_path) pairs of the whole job for write_log.
+    The journal is removed once the folder is consistent again.
+    """
+    from .executor import DirRenamer, StepRunner
+    
+    if mode not in ("resume", "rollback"):
+        raise ValueError(f"Unknown recovery mode: {mode}")
+    
+    state = read_journal(path)
+    folder = state['folder']
+    if not os.path.isabs(folder):
+        # Written with a relative folder; the journal lives in the folder itself
+        folder = os.path.dirname(os.path.abspath(path))
+    folder = Path(folder)
+    steps = state['steps']
+    
+    with DirRenamer(folder) as renamer:
+        position = state['position']
+        if state['pending'] is not None:
+            position = _settle_pending(renamer, steps, state['pending'])
+        found = position
+        
+        journal = RenameJournal(path, open(path, 'a', encoding='utf-8'))
+        journal.commit(position)
+        runner = StepRunner(renamer, steps, journal, position)
+        try:
+            if mode == "resume":
+                runner.forward(progress)
+                failures = 0
+            else:
+                failures = runner.backward(progress)
+        except BaseException:
+            journal.close()
+            raise
+        journal.finish(runner.position, remove=not failures)
+    
+    result = {'mode': mode, 'position': found, 'steps': len(steps), 'failures': failures}
+    if mode == "resume":
+        result['renames'] = [(folder / old_name, folder / new_name)
+                             for old_name, new_name in original_renames(steps)]
+    return result
@@ -0,0 +1,352 @@
+"""
+Rename logs and undo.
+
+Two formats are supported. The CSV log has one old_path,new_path,timestamp row
+per file. The compact log (write_compact_log) is a magic line followed by a
+zlib stream of NUL-terminated fields: the folder is written once per change of
+directory, and runs of names that differ only by an evenly stepped frame
+number are stored as one template record, so a renumbered sequence takes a
+few dozen bytes whatever its length. undo_from_log reads either format as a
+stream.
+
+A folder keeps one log: writing rename_log.csv or the compact log under its
+default name removes the other one, and find_log picks the newer of the two.
+LogAppender only ever adds to a log and removes nothing.
+
+Compact records (first field is the kind):
+    V version timestamp
+    D folder                      folder of the following L and R records
+    L old_name new_name
+    R old_head old_tail old_width old_start old_step
+      new_head new_tail new_width new_start new_step count
+    P old_path new_path           a pair that moves between folders
+"""
+
+import csv
+import itertools
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+from .executor import DirRenamer, plan_rename_steps
+from .instrument import count, timed
+from .progress import JobCancelled, PROGRESS_INTERVAL
+
+LOG_NAME = "rename_log.csv"
+COMPACT_LOG_NAME = "rename_log.seqlog"
+COMPACT_LOG_MAGIC = b"PNGSEQLOG\n"
+COMPACT_LOG_VERSION = 1
+# ASCII digits only: int() also reads other scripts' digits, which would not round-trip
+_FRAME_RE = re.compile(r'^(.*?)([0-9]+)([^0-9]*)$', re.DOTALL)
+_READ_SIZE = 1 << 16
+
+
+def _remove_other_log(log_file_path, other_name):
+    """Remove the other format's log next to a log written under its default name.
+
+    Left in place, the older log could be found by undo instead of the new one.
+    """
+    folder, name = os.path.split(log_file_path)
+    if name in (LOG_NAME, COMPACT_LOG_NAME):
+        try:
+            os.remove(os.path.join(folder, other_name))
+        except FileNotFoundError:
+            pass
+
+
+def find_log(folder):
+    """Return the path of the rename log in folder, the newer one if both formats are there.
+
+    Without any log, the rename_log.csv path is returned (undo reports it missing).
+    """
+    found = []
+    for name in (LOG_NAME, COMPACT_LOG_NAME):
+        path = os.path.join(folder, name)
+        try:
+            found.append((os.stat(path).st_mtime_ns, path))
+        except FileNotFoundError:
+            continue
+    if not found:
+        return os.path.join(folder, LOG_NAME)
+    return max(found)[1]
+
+
+@timed('write_log')
+def write_log(renames, log_file_path):
+    """Write rename operations to CSV log file."""
+    try:
+        with open(log_file_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['old_path', 'new_path', 'timestamp'])
+            timestamp = datetime.now().isoformat()
+            for old_path, new_path in renames:
+                writer.writerow([str(old_path), str(new_path), timestamp])
+            count('log.bytes', f.tell())
+    except Exception as e:
+        raise Exception(f"Failed to write log: {e}")
+    _remove_other_log(log_file_path, COMPACT_LOG_NAME)
+
+
+class LogAppender:
+    """CSV log written one rename at a time, in the write_log format.
+
+    For jobs that rename as they go (watch mode): every row is flushed as it
+    is added, so the log is complete up to the last rename if the process dies.
+    An existing log is appended to, so a restarted job keeps the undo records
+    of the earlier runs; the header is only written to a new or empty file.
+    """
+    
+    def __init__(self, log_file_path):
+        self._file = open(log_file_path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._start = self._file.tell()
+        if self._start == 0:
+            self._writer.writerow(['old_path', 'new_path', 'timestamp'])
+            self._file.flush()
+    
+    def add(self, old_path, new_path):
+        self._writer.writerow([str(old_path), str(new_path), datetime.now().isoformat()])
+        self._file.flush()
+    
+    def close(self):
+        count('log.bytes', self._file.tell() - self._start)
+        self._file.close()
+
+
+def _frame_parts(name):
+    """Split name around its last number: (head, digits, tail), or None."""
+    match = _FRAME_RE.match(name)
+    return match.groups() if match else None
+
+
+@timed('write_log')
+def write_compact_log(renames, log_file_path):
+    """Write rename operations to a compact log (see the module docstring)."""
+    import zlib
+    
+    compressor = zlib.compressobj(9)
+    
+    try:
+        with open(log_file_path, 'wb') as f:
+            f.write(COMPACT_LOG_MAGIC)
+            pending = []
+            
+            def emit(*fields):
+                for field in fields:
+                    pending.append(str(field).encode('utf-8', 'surrogateescape'))
+                    pending.append(b'\0')
+                if len(pending) >= 2048:
+                    f.write(compressor.compress(b''.join(pending)))
+                    pending.clear()
+            
+            # run = [old_head, old_tail, old_width, old_start, old_step,
+            #        new_head, new_tail, new_width, new_start, new_step, count]
+            run = None
+            # Names of the first pair of the run, written as they are if it stays alone
+            run_names = None
+            
+            def flush():
+                if run is None:
+                    return
+                if run[10] == 1:
+                    emit('L', *run_names)
+                else:
+                    emit('R', *run)
+            
+            emit('V', COMPACT_LOG_VERSION, datetime.now().isoformat())
+            folder = None
+            # Full paths the current run predicts next; a match skips parsing
+            expect_old = expect_new = None
+            for old_path, new_path in renames:
+                old_path = os.fspath(old_path)
+                new_path = os.fspath(new_path)
+                if old_path == expect_old and new_path == expect_new:
+                    length = run[10] = run[10] + 1
+                    expect_old = f"{old_prefix}{str(run[3] + run[4] * length).zfill(run[2])}{run[1]}"
+                    expect_new = f"{new_prefix}{str(run[8] + run[9] * length).zfill(run[7])}{run[6]}"
+                    continue
+                expect_old = expect_new = None
+                
+                old_folder, old_name = os.path.split(old_path)
+                new_folder, new_name = os.path.split(new_path)
+                if old_folder != new_folder:
+                    flush()
+                    run = None
+                    emit('P', old_path, new_path)
+                    continue
+                if old_folder != folder:
+                    flush()
+                    run = None
+                    folder = old_folder
+                    emit('D', folder)
+                
+                old_parts = _frame_parts(old_name)
+                new_parts = _frame_parts(new_name)
+                if old_parts is None or new_parts is None:
+                    flush()
+                    run = None
+                    emit('L', old_name, new_name)
+                    continue
+                old_index = int(old_parts[1])
+                new_index = int(new_parts[1])
+                
+                # Second pair of a run: it fixes the steps of both indices
+                if (run is not None and run[10] == 1 and run[0] == old_parts[0] and run[1] == old_parts[2]
+                        and run[5] == new_parts[0] and run[6] == new_parts[2]
+                        and str(old_index).zfill(run[2]) == old_parts[1]
+                        and str(new_index).zfill(run[7]) == new_parts[1]):
+                    run[4] = old_index - run[3]
+                    run[9] = new_index - run[8]
+                    run[10] = 2
+                    old_prefix = os.path.join(folder, run[0])
+                    new_prefix = os.path.join(folder, run[5])
+                    expect_old = f"{old_prefix}{str(run[3] + run[4] * 2).zfill(run[2])}{run[1]}"
+                    expect_new = f"{new_prefix}{str(run[8] + run[9] * 2).zfill(run[7])}{run[6]}"
+                    continue
+                
+                flush()
+                run = [old_parts[0], old_parts[2], len(old_parts[1]), old_index, 0,
+                       new_parts[0], new_parts[2], len(new_parts[1]), new_index, 0, 1]
+                run_names = (old_name, new_name)
+            flush()
+            
+            f.write(compressor.compress(b''.join(pending)))
+            f.write(compressor.flush())
+            count('log.bytes', f.tell())
+    except Exception as e:
+        raise Exception(f"Failed to write log: {e}")
+    _remove_other_log(log_file_path, LOG_NAME)
+
+
+def _iter_compact_fields(f):
+    """Yield the decoded fields of a compact log body, decompressing as it goes."""
+    import zlib
+    
+    decompressor = zlib.decompressobj()
+    rest = b''
+    while True:
+        chunk = f.read(_READ_SIZE)
+        data = rest + (decompressor.decompress(chunk) if chunk else decompressor.flush())
+        fields = data.split(b'\0')
+        rest = fields.pop()
+        for field in fields:
+            yield field.decode('utf-8', 'surrogateescape')
+        if not chunk:
+            break
+    if rest:
+        raise ValueError("Truncated compact log")
+
+
+def _iter_compact_log(f):
+    """Yield (old_path, new_path) string pairs from an open compact log."""
+    fields = _iter_compact_fields(f)
+    folder = None
+    for kind in fields:
+        if kind == 'L':
+            old_name, new_name = next(fields), next(fields)
+            yield os.path.join(folder, old_name), os.path.join(folder, new_name)
+        elif kind == 'R':
+            old_head, old_tail, old_width, old_start, old_step = [next(fields) for _ in range(5)]
+            new_head, new_tail, new_width, new_start, new_step, count = [next(fields) for _ in range(6)]
+            old_width, old_start, old_step = int(old_width), int(old_start), int(old_step)
+            new_width, new_start, new_step = int(new_width), int(new_start), int(new_step)
+            old_prefix = os.path.join(folder, old_head)
+            new_prefix = os.path.join(folder, new_head)
+            for i in range(int(count)):
+                yield (f"{old_prefix}{str(old_start + old_step * i).zfill(old_width)}{old_tail}",
+                       f"{new_prefix}{str(new_start + new_step * i).zfill(new_width)}{new_tail}")
+        elif kind == 'D':
+            folder = next(fields)
+        elif kind == 'P':
+            yield next(fields), next(fields)
+        elif kind == 'V':
+            version = int(next(fields))
+            next(fields)  # timestamp
+            if version != COMPACT_LOG_VERSION:
+                raise ValueError(f"Unsupported compact log version: {version}")
+        else:
+            raise ValueError(f"Unknown compact log record: {kind!r}")
+
+
+def iter_log(log_file_path):
+    """Yield (old_path, new_path) string pairs from a CSV or compact log, in order."""
+    with open(log_file_path, 'rb') as f:
+        compact = f.read(len(COMPACT_LOG_MAGIC)) == COMPACT_LOG_MAGIC
+        if compact:
+            yield from _iter_compact_log(f)
+            return
+    with open(log_file_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            yield row['old_path'], row['new_path']
+
+
+@timed('undo')
+def undo_from_log(log_file_path, progress=None):
+    """Undo renames by reading from a CSV or compact log file.
+
+    The log is streamed. A file whose original name is still taken (e.g. the
+    log order runs against a chain of renames) is set aside, and those
+    leftovers are ordered with plan_rename_steps once the log has been read.
+    The log is removed afterwards, unless none of its files could be found.
+    """
+    if not os.path.exists(log_file_path):
+        raise FileNotFoundError("Log file not found")
+    
+    renamers = {}
+    blocked = {}
+    undone = []
+    missing = 0
+    try:
+        for row, (old_path, new_path) in enumerate(iter_log(log_file_path)):
+            if progress is not None and row % PROGRESS_INTERVAL == 0:
+                progress("Undoing", len(undone), None)
+            new_path = Path(new_path)
+            old_path = Path(old_path)
+            
+            # Rename relative to one open fd per folder; files that are
+            # already gone are skipped instead of being checked up front
+            try:
+                if new_path.parent == old_path.parent:
+                    renamer = renamers.get(new_path.parent)
+                    if renamer is None:
+                        renamer = renamers[new_path.parent] = DirRenamer(new_path.parent)
+                    try:
+                        renamer.rename(new_path.name, old_path.name)
+                    except FileExistsError:
+                        count('rename.retries')
+                        blocked.setdefault(new_path.parent, []).append((new_path, old_path.name))
+                        continue
+                else:
+                    new_path.rename(old_path)
+            except FileNotFoundError:
+                missing += 1
+                continue
+            undone.append((new_path, old_path))
+        
+        # Rename what was blocked in dependency order (cycles go through a temp name)
+        for folder, renames in blocked.items():
+            pre_steps, chains, post_steps = plan_rename_steps(renames)
+            renamer = renamers[folder]
+            for src, dst in itertools.chain(pre_steps, itertools.chain.from_iterable(chains), post_steps):
+                renamer.rename(src, dst)
+            undone.extend((new_path, folder / old_name) for new_path, old_name in renames)
+        
+        # Keep the log if nothing in it was found, e.g. a log of relative paths
+        # read from another directory; removing it would lose the undo for good
+        if missing and not undone:
+            raise FileNotFoundError(f"None of the {missing} renamed files in the log were found; log kept")
+        
+        # Remove the log file after successful undo
+        os.remove(log_file_path)
+        return undone
+    
+    except JobCancelled:
+        raise
+    except Exception as e:
+        count('undo.failures')
+        raise Exception(f"Failed to undo renames: {e}")
+    finally:
+        count('fs.rename', len(undone))
+        for renamer in renamers.values():
+            renamer.close()
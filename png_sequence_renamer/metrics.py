@@ -0,0 +1,224 @@
+"""
+Metrics export
+
+Writes what the instrument module recorded during a job as counters, gauges
+and histograms in a text file for the Prometheus node_exporter textfile
+collector (point it at a "*.prom" file in its directory), or in OpenMetrics
+format. Nothing is measured per file beyond the instrument counters, which
+are one dict update each, and only while a job is recorded.
+
+The file accumulates: counters and histograms of a new job are added to the
+values already in it, gauges describe the last job of each command. Every
+sample has a command label. The file is replaced atomically, but two jobs
+writing the same file at the same moment can lose one job's increments, so
+concurrent jobs (e.g. several farm processes on one host) should each get
+their own file.
+
+Use export_metrics() around any pipeline call, or --metrics on the command
+line:
+
+    with export_metrics("/var/lib/node_exporter/renamer.prom", "rename"):
+        two_phase_rename(renames, folder)
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from .instrument import Recorder, recording
+
+METRIC_PREFIX = "png_renamer_"
+# Upper bounds in seconds of the phase latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+# Phases whose time is spent renaming, the denominator of renames per second
+RENAME_PHASES = ('rename', 'undo', 'recover')
+
+# Counter families: name, help, [(instrument counter, extra labels)]
+COUNTERS = (
+    ('jobs', "Jobs run, by result.", ()),
+    ('files_scanned', "PNG files found by folder scans.", [('scan.files', {})]),
+    ('renames', "Files renamed, temporary names and rollbacks included.", [('fs.rename', {})]),
+    ('fs_calls', "Filesystem calls, by kind.", [
+        ('fs.scandir', {'call': "scandir"}),
+        ('fs.stat', {'call': "stat"}),
+        ('fs.rename', {'call': "rename"}),
+        ('fs.fsync', {'call': "fsync"}),
+    ]),
+    ('bytes_written', "Bytes written to rename logs, journals and folder indexes.", [
+        ('log.bytes', {'file': "log"}),
+        ('journal.bytes', {'file': "journal"}),
+        ('index.bytes', {'file': "index"}),
+    ]),
+    ('retries', "Renames that found their target taken and were retried.", [('rename.retries', {})]),
+    ('failures', "Failures, by kind.", [
+        ('rename.failures', {'kind': "rename"}),
+        ('rollback.failures', {'kind': "rollback"}),
+        ('undo.failures', {'kind': "undo"}),
+        ('batch.error', {'kind': "folder_error"}),
+        ('batch.collisions', {'kind': "folder_collisions"}),
+        ('batch.interrupted', {'kind': "folder_interrupted"}),
+    ]),
+)
+
+# Gauge families: name, help
+GAUGES = (
+    ('last_job_timestamp_seconds', "Unix time the last job finished."),
+    ('last_job_success', "1 if the last job succeeded, 0 if it failed."),
+    ('last_job_duration_seconds', "Wall time of the last job."),
+    ('last_job_renames_per_second', "Renames per second of renaming time in the last job."),
+)
+
+HISTOGRAM = ('phase_duration_seconds', "Time spent in each pipeline phase, one observation per call.")
+
+
+class MetricsRecorder(Recorder):
+    """Recorder that also keeps a latency histogram per phase.
+
+    Every add_phase is one observation; a merged batch worker report adds one
+    observation per phase and folder.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.histograms = {}
+    
+    def add_phase(self, name, seconds, calls=1):
+        super().add_phase(name, seconds, calls)
+        buckets = self.histograms.get(name)
+        if buckets is None:
+            buckets = self.histograms[name] = [0] * (len(LATENCY_BUCKETS) + 1)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                buckets[i] += 1
+                break
+        else:
+            buckets[-1] += 1
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _sample_key(name, labels):
+    """Return the sample line up to its value: name{label="value",...}."""
+    return name + '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+
+def _format_value(value):
+    if value == int(value) and abs(value) < 2 ** 53:
+        return str(int(value))
+    return repr(round(float(value), 6))
+
+
+def read_samples(path):
+    """Return {sample key: value} from a metrics file written earlier, or {} if there is none."""
+    samples = {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('#') or not line.strip():
+                    continue
+                key, _, value = line.rstrip('\n').rpartition(' ')
+                try:
+                    samples[key] = float(value)
+                except ValueError:
+                    continue  # Not a line of ours
+    except OSError:
+        pass
+    return samples
+
+
+def _families(recorder, command, success):
+    """Yield (kind, name, help, {sample key: value}) for one recorded job."""
+    report = recorder.report()
+    counters = report['counters']
+    labels = {'command': command}
+    
+    for name, help_text, sources in COUNTERS:
+        samples = {}
+        if name == 'jobs':
+            samples[_sample_key(f"{METRIC_PREFIX}jobs_total",
+                                dict(labels, result="success" if success else "failure"))] = 1
+        for counter, extra in sources:
+            samples[_sample_key(f"{METRIC_PREFIX}{name}_total", dict(labels, **extra))] = counters.get(counter, 0)
+        yield 'counter', name, help_text, samples
+    
+    rename_seconds = sum(phase['seconds'] for name, phase in report['phases'].items()
+                         if name in RENAME_PHASES) or report['seconds']
+    renames = counters.get('fs.rename', 0)
+    values = {
+        'last_job_timestamp_seconds': round(time.time(), 3),
+        'last_job_success': 1 if success else 0,
+        'last_job_duration_seconds': report['seconds'],
+        'last_job_renames_per_second': round(renames / rename_seconds, 3) if rename_seconds > 0 else 0,
+    }
+    for name, help_text in GAUGES:
+        yield 'gauge', name, help_text, {_sample_key(f"{METRIC_PREFIX}{name}", labels): values[name]}
+    
+    name, help_text = HISTOGRAM
+    samples = {}
+    histograms = getattr(recorder, 'histograms', {})
+    for phase_name, phase in report['phases'].items():
+        phase_labels = dict(labels, phase=phase_name)
+        cumulative = 0
+        buckets = histograms.get(phase_name, [0] * len(LATENCY_BUCKETS) + [phase['calls']])
+        for bound, bucket_count in zip(LATENCY_BUCKETS + ('+Inf',), buckets):
+            cumulative += bucket_count
+            samples[_sample_key(f"{METRIC_PREFIX}{name}_bucket", dict(phase_labels, le=bound))] = cumulative
+        samples[_sample_key(f"{METRIC_PREFIX}{name}_sum", phase_labels)] = phase['seconds']
+        samples[_sample_key(f"{METRIC_PREFIX}{name}_count", phase_labels)] = cumulative
+    yield 'histogram', name, help_text, samples
+
+
+def render_metrics(recorder, command, success=True, previous=None, openmetrics=False):
+    """Return the metrics text for a recorded job, added to the previous samples of the file.
+
+    Without openmetrics the result is the Prometheus text format read by the
+    textfile collector (counter families named *_total); with it, OpenMetrics
+    1.0 (families without the suffix, ending in "# EOF").
+    """
+    previous = dict(previous or {})
+    lines = []
+    for kind, name, help_text, samples in _families(recorder, command, success):
+        family = f"{METRIC_PREFIX}{name}"
+        if kind == 'counter' and not openmetrics:
+            family += "_total"
+        # Samples of other commands stay as they were; ours are added to or replaced
+        prefixes = (f"{family}{{", f"{family}_")
+        merged = {key: value for key, value in previous.items() if key.startswith(prefixes)}
+        for key, value in samples.items():
+            if kind != 'gauge':
+                value += merged.get(key, 0)
+            merged[key] = value
+        lines.append(f"# HELP {family} {help_text}")
+        lines.append(f"# TYPE {family} {kind}")
+        lines.extend(f"{key} {_format_value(value)}" for key, value in merged.items())
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path, recorder, command, success=True, openmetrics=False):
+    """Add a recorded job to the metrics file at path, replacing it atomically."""
+    text = render_metrics(recorder, command, success, read_samples(path), openmetrics)
+    # The collector only reads *.prom files, so the temporary file is never half read
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+@contextmanager
+def export_metrics(path, command, openmetrics=False):
+    """Record the block as one job and add it to the metrics file at path (see the module docstring).
+
+    A block that raises is written as a failed job and the error is re-raised.
+    """
+    recorder = MetricsRecorder()
+    success = False
+    try:
+        with recording(recorder):
+            yield recorder
+        success = True
+    finally:
+        write_metrics(path, recorder, command, success, openmetrics)
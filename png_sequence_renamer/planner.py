@@ -0,0 +1,159 @@
+"""
+Rename planning and collision detection.
+"""
+
+import bisect
+import itertools
+import os
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+from .instrument import count, timed
+from .progress import PROGRESS_INTERVAL
+
+# Default filesystems on Windows and macOS treat names differing only in case as the same file
+CASE_INSENSITIVE_FS = sys.platform in ('win32', 'darwin')
+
+
+def resolve_padding(zero_padding, start_index, total_files):
+    """Return zero_padding, or the width of the largest index when it is 0 (auto-detect)."""
+    if zero_padding == 0:
+        max_index = start_index + total_files - 1
+        zero_padding = len(str(max_index))
+    return zero_padding
+
+
+def format_target_name(basename, index, zero_padding, prefix, suffix):
+    """Build the new file name for a sequence index."""
+    index_str = str(index).zfill(zero_padding)
+    return f"{prefix}{basename}_{index_str}{suffix}.png"
+
+
+class RenamePlan(Sequence):
+    """Read-only sequence of (old_path, new_name) pairs for a numbered rename.
+
+    Only the source list and the naming template are stored; new names are
+    formatted when a pair is read, so len() and indexing are O(1) and a plan
+    costs little more than its source list. sources must not change afterwards.
+    """
+    
+    def __init__(self, sources, basename, start_index, zero_padding, prefix, suffix):
+        self.sources = sources
+        self.basename = basename
+        self.start_index = start_index
+        # Auto-detect padding if not specified
+        self.zero_padding = resolve_padding(zero_padding, start_index, len(sources))
+        self.prefix = prefix
+        self.suffix = suffix
+    
+    def __len__(self):
+        return len(self.sources)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.sources)))]
+        old_path = self.sources[index]
+        if index < 0:
+            index += len(self.sources)
+        return old_path, self.target_name(index)
+    
+    def __iter__(self):
+        # Same names as target_name, with the constant parts formatted once
+        head = f"{self.prefix}{self.basename}_"
+        tail = f"{self.suffix}.png"
+        start_index = self.start_index
+        zero_padding = self.zero_padding
+        for i, old_path in enumerate(self.sources):
+            yield old_path, f"{head}{str(start_index + i).zfill(zero_padding)}{tail}"
+    
+    def target_name(self, index):
+        """Return the new name of the file at position index."""
+        return format_target_name(self.basename, self.start_index + index, self.zero_padding,
+                                  self.prefix, self.suffix)
+
+
+class GroupedPlan(Sequence):
+    """Several RenamePlans read as one sequence of (old_path, new_name) pairs."""
+    
+    def __init__(self, plans):
+        self.plans = list(plans)
+        # End offset of each plan, for bisecting an index to its plan
+        self.ends = list(itertools.accumulate(len(plan) for plan in self.plans))
+    
+    def __len__(self):
+        return self.ends[-1] if self.ends else 0
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("plan index out of range")
+        part = bisect.bisect_right(self.ends, index)
+        return self.plans[part][index - (self.ends[part - 1] if part else 0)]
+    
+    def __iter__(self):
+        return itertools.chain.from_iterable(self.plans)
+
+
+@timed('plan')
+def plan_renames(png_files, basename, start_index, zero_padding, prefix, suffix):
+    """Plan the rename operations and return a RenamePlan of (old_path, new_name) pairs."""
+    if not basename.strip():
+        raise ValueError("Basename is required")
+    
+    if not isinstance(png_files, Sequence):
+        png_files = list(png_files)
+    return RenamePlan(png_files, basename, start_index, zero_padding, prefix, suffix)
+
+
+@timed('collisions')
+def detect_collisions(renames, folder_path, existing_names=None, case_insensitive=None, progress=None):
+    """Detect naming collisions and return list of collision messages.
+
+    A target only collides with an existing file if that file is not itself
+    being renamed away; the executor orders chains and cycles safely. Pass the
+    listing collected by scan_folder as existing_names to check without any
+    filesystem calls. case_insensitive compares names case-folded and defaults
+    to CASE_INSENSITIVE_FS.
+    """
+    folder = Path(folder_path)
+    if case_insensitive is None:
+        case_insensitive = CASE_INSENSITIVE_FS
+    fold = str.casefold if case_insensitive else str
+    
+    if not isinstance(renames, Sequence):
+        renames = list(renames)
+    source_names = {fold(os.path.basename(old_path)) for old_path, _ in renames}
+    if existing_names is not None and case_insensitive:
+        existing_names = {fold(name) for name in existing_names}
+    
+    collisions = []
+    new_names = set()
+    
+    for i, (old_path, new_name) in enumerate(renames):
+        if progress is not None and i % PROGRESS_INTERVAL == 0:
+            progress("Checking collisions", i, len(renames))
+        key = fold(new_name)
+        
+        # Check if new name already used in this rename batch
+        if key in new_names:
+            collisions.append(f"Duplicate target name: {new_name}")
+        new_names.add(key)
+        
+        # Names held by files in this batch are freed before they are reused
+        if key in source_names:
+            continue
+        
+        # Check if target file exists outside of this batch
+        if existing_names is not None:
+            exists = key in existing_names
+        else:
+            exists = (folder / new_name).exists()
+            count('fs.stat')
+        if exists:
+            collisions.append(f"Would overwrite existing file: {new_name}")
+    
+    return collisions
@@ -0,0 +1,10 @@
+"""
+Progress reporting shared by the long-running core functions.
+"""
+
+# Long-running functions call progress(phase, done, total) every PROGRESS_INTERVAL items
+PROGRESS_INTERVAL = 1000
+
+
+class JobCancelled(Exception):
+    """Raised from a progress callback to stop a long-running job."""
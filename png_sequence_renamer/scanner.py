@@ -0,0 +1,91 @@
+"""
+Folder scanning built on os.scandir.
+"""
+
+import os
+from collections import namedtuple
+from pathlib import Path
+
+from .instrument import count, phase, timed
+from .progress import PROGRESS_INTERVAL
+from .sorting import FrameIndex, natural_sort_key
+
+# A PNG file found by scan_folder. ``stat`` holds the os.stat_result read during
+# the scan (or None when the sort mode did not need it) so later stages never
+# have to go back to the filesystem.
+ScanEntry = namedtuple('ScanEntry', ['name', 'path', 'stat'])
+
+
+def iter_png_entries(folder_path, with_stat=False, listing=None):
+    """Yield unsorted ScanEntry records for the PNG files in folder, straight from os.scandir.
+
+    If listing is a set, the name of every directory entry (PNG or not) is
+    added to it, so collision checks can run without listing the folder again.
+    """
+    count('fs.scandir')
+    with os.scandir(folder_path) as it:
+        for entry in it:
+            name = entry.name
+            if listing is not None:
+                listing.add(name)
+            # Cheap name check first so non-PNG entries cost nothing extra
+            if len(name) <= 4 or name[-4:].lower() != '.png':
+                continue
+            if not entry.is_file():
+                continue
+            yield ScanEntry(name, entry.path, entry.stat() if with_stat else None)
+
+
+def entry_sort_key(sort_mode):
+    """Return the ScanEntry sort key for sort_mode, or None if the mode keeps listing order."""
+    if sort_mode == "Name":
+        return lambda e: natural_sort_key(e.name)
+    elif sort_mode == "Modified":
+        return lambda e: e.stat.st_mtime
+    elif sort_mode == "Created":
+        return lambda e: e.stat.st_ctime
+    return None
+
+
+@timed('scan')
+def scan_folder(folder_path, sort_mode, with_stat=None, listing=None, progress=None):
+    """Scan folder once with os.scandir and return sorted ScanEntry records.
+
+    File type comes from the directory listing itself, and stat data is read at
+    most once per entry. By default it is only read for the "Modified" and
+    "Created" sort modes, which need it. listing is passed to iter_png_entries.
+    """
+    if with_stat is None:
+        with_stat = sort_mode in ("Modified", "Created")
+    
+    entries = []
+    for entry in iter_png_entries(folder_path, with_stat, listing):
+        entries.append(entry)
+        if progress is not None and len(entries) % PROGRESS_INTERVAL == 0:
+            progress("Scanning", len(entries), None)
+    count('scan.files', len(entries))
+    if with_stat:
+        count('fs.stat', len(entries))
+    
+    # Sort based on mode, using only data captured during the scan
+    key = entry_sort_key(sort_mode)
+    if key is not None:
+        if progress is not None:
+            progress("Sorting", 0, len(entries))
+        with phase('sort'):
+            if sort_mode == "Name":
+                # Same order as sorting by key, mostly through integer frame numbers
+                order = FrameIndex([entry.name for entry in entries]).order()
+                entries = [entries[i] for i in order]
+            else:
+                entries.sort(key=key)
+    
+    return entries
+
+
+def get_png_files(folder_path, sort_mode):
+    """Get all PNG files from folder and sort them according to sort_mode."""
+    try:
+        return [Path(entry.path) for entry in scan_folder(folder_path, sort_mode)]
+    except Exception:
+        return []
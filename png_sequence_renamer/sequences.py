@@ -0,0 +1,90 @@
+"""
+Detection of several frame sequences (render passes) in one folder.
+
+A folder holding beauty.####.png, depth.####.png and mask.####.png is three
+sequences, not one. group_sequences sorts files into sequences by the text
+around their frame number in a single pass over the listing, and
+plan_sequence_renames gives each sequence its own numbering.
+"""
+
+import os
+from array import array
+from collections import namedtuple
+
+from .instrument import timed
+from .planner import GroupedPlan, RenamePlan
+from .sorting import FrameIndex, frame_pattern
+
+# One sequence: head and tail as spelled by its first file, then the frame
+# number and path of every file, in the order they were given. runs is the
+# run-length form of frames: start, end, start, end, ... of every stretch of
+# consecutive ascending frame numbers, so a sorted gapless sequence is one run.
+FrameSequence = namedtuple('FrameSequence', ['head', 'tail', 'frames', 'paths', 'runs'])
+
+
+def sequence_label(sequence):
+    """Display name of a sequence, e.g. "beauty.#.png"."""
+    return f"{sequence.head}#{sequence.tail}"
+
+
+def pass_name(sequence):
+    """Name of the pass a sequence holds, e.g. "beauty" for beauty.####.png."""
+    return sequence.head.rstrip('._- ')
+
+
+@timed('group_sequences')
+def group_sequences(paths):
+    """Group paths by the text around their frame number, in one pass.
+
+    Returns (sequences, unnumbered): FrameSequence records in order of first
+    appearance, each keeping its files in input order (so a sorted scan stays
+    sorted), and the paths whose name has no usable frame number. Names are
+    matched lowercased, like natural_sort_key compares them.
+    """
+    groups = {}
+    unnumbered = []
+    for path in paths:
+        name = os.path.basename(path)
+        lowered = name.lower()
+        pattern = frame_pattern(lowered)
+        if pattern is None:
+            unnumbered.append(path)
+            continue
+        head, tail = pattern
+        frame = int(lowered[len(head):len(lowered) - len(tail)])
+        if frame > FrameIndex.MAX_FRAME:
+            unnumbered.append(path)
+            continue
+        
+        sequence = groups.get(pattern)
+        if sequence is None:
+            if len(lowered) == len(name):
+                head, tail = name[:len(head)], name[len(name) - len(tail):]
+            sequence = groups[pattern] = FrameSequence(head, tail, array('q'), [], array('q'))
+        sequence.frames.append(frame)
+        sequence.paths.append(path)
+        runs = sequence.runs
+        if runs and runs[-1] == frame - 1:
+            runs[-1] = frame
+        else:
+            runs.append(frame)
+            runs.append(frame)
+    return list(groups.values()), unnumbered
+
+
+@timed('plan')
+def plan_sequence_renames(sequences, basename, start_index, zero_padding, prefix, suffix):
+    """Plan one numbering per sequence and return them as one GroupedPlan.
+
+    Each sequence keeps its pass name: beauty.0001.png -> <basename>_beauty_0001.png.
+    Padding is resolved per sequence.
+    """
+    if not basename.strip():
+        raise ValueError("Basename is required")
+    
+    plans = []
+    for sequence in sequences:
+        name = pass_name(sequence)
+        plans.append(RenamePlan(sequence.paths, f"{basename}_{name}" if name else basename,
+                                start_index, zero_padding, prefix, suffix))
+    return GroupedPlan(plans)
@@ -0,0 +1,152 @@
+"""
+Cached preview session.
+
+Previewing a rename is scan -> sort -> plan -> collision check, but while the
+user only tries out naming options the first two steps give the same result
+every time. RenameSession keeps them and redoes only the cheap part.
+"""
+
+import os
+from pathlib import Path
+
+from .planner import CASE_INSENSITIVE_FS, detect_collisions, plan_renames
+from .index_cache import cached_scan
+from .instrument import count, timed
+from .scanner import scan_folder
+from .sequences import group_sequences, plan_sequence_renames
+
+
+class RenameSession:
+    """Scan results of one folder, reused while only the naming template changes.
+
+    scan() lists and sorts the folder once per folder and sort mode, and again
+    only when the folder's modification time changes (files added, removed or
+    renamed; content edits that would reorder a "Modified" sort are not seen
+    until invalidate() is called). With index_cache (the default) the scan
+    goes through cached_scan, so a folder seen in an earlier run reopens
+    without being listed. plan() builds a RenamePlan from the cached sources
+    and checks it against the names that stay in place, which costs time in
+    proportion to those names rather than to the number of files.
+    """
+    
+    def __init__(self, case_insensitive=None, index_cache=True):
+        if case_insensitive is None:
+            case_insensitive = CASE_INSENSITIVE_FS
+        self.case_insensitive = case_insensitive
+        self.index_cache = index_cache
+        self.invalidate()
+    
+    def invalidate(self):
+        """Forget the cached scan, e.g. after renaming files in the folder."""
+        self.folder = None
+        self.sort_mode = None
+        self.mtime_ns = None
+        self.sources = []
+        # Folded name -> name of every entry that is not a source, i.e. names
+        # that stay taken whatever the plan is
+        self.kept_names = {}
+        self._sequences = None
+        self._collisions = {}
+    
+    def _folder_mtime(self, folder):
+        count('fs.stat')
+        try:
+            return os.stat(folder).st_mtime_ns
+        except OSError:
+            return None
+    
+    def is_current(self, folder, sort_mode):
+        """Return True if the cached scan is still valid for folder and sort_mode."""
+        return (self.folder == folder and self.sort_mode == sort_mode
+                and self.mtime_ns is not None and self._folder_mtime(folder) == self.mtime_ns)
+    
+    def scan(self, folder, sort_mode, progress=None):
+        """Return the sorted PNG paths of folder, scanning only when the cache is stale."""
+        if self.is_current(folder, sort_mode):
+            return self.sources
+        
+        self.invalidate()
+        # Read the mtime first so a change during the scan forces a rescan later
+        mtime_ns = self._folder_mtime(folder)
+        listing = set()
+        scan = cached_scan if self.index_cache else scan_folder
+        entries = scan(folder, sort_mode, listing=listing, progress=progress)
+        
+        fold = str.casefold if self.case_insensitive else str
+        kept_names = {fold(name): name for name in listing}
+        for entry in entries:
+            kept_names.pop(fold(entry.name), None)
+        
+        self.sources = [Path(entry.path) for entry in entries]
+        self.kept_names = kept_names
+        self.folder = folder
+        self.sort_mode = sort_mode
+        self.mtime_ns = mtime_ns
+        return self.sources
+    
+    def sequences(self):
+        """Return group_sequences() of the cached sources, computed once per scan."""
+        sequences = self._sequences
+        if sequences is None:
+            sequences = self._sequences = group_sequences(self.sources)
+        return sequences
+    
+    def has_sequences(self):
+        """Return True if sequences() is cached and returns without work."""
+        return self._sequences is not None
+    
+    def build(self, basename, start_index, zero_padding, prefix, suffix, split=False):
+        """Return the plan for the cached sources: a RenamePlan, or a GroupedPlan if split."""
+        if split:
+            return plan_sequence_renames(self.sequences()[0], basename, start_index, zero_padding,
+                                         prefix, suffix)
+        return plan_renames(self.sources, basename, start_index, zero_padding, prefix, suffix)
+    
+    def plan(self, basename, start_index, zero_padding, prefix, suffix, split=False):
+        """Return (plan, collision messages) for the cached sources."""
+        # Bound first: a rescan on another thread starts a fresh cache
+        cache = self._collisions
+        folder = self.folder
+        renames = self.build(basename, start_index, zero_padding, prefix, suffix, split)
+        key = (basename, start_index, zero_padding, prefix, suffix, split)
+        collisions = cache.get(key)
+        if collisions is None:
+            if split:
+                # Files outside every sequence stay put; check against the full listing
+                listing = set(self.kept_names.values())
+                listing.update(path.name for path in self.sources)
+                collisions = detect_collisions(renames, folder, existing_names=listing,
+                                               case_insensitive=self.case_insensitive)
+            else:
+                collisions = self.collisions(renames)
+            cache[key] = collisions
+        return renames, collisions
+    
+    @timed('collisions')
+    def collisions(self, renames):
+        """Return the detect_collisions messages for a RenamePlan of the cached sources.
+
+        Targets of a RenamePlan are distinct, so the only collisions are kept
+        names that the template can produce. Each kept name is parsed back
+        into an index instead of every target being formatted.
+        """
+        fold = str.casefold if self.case_insensitive else str
+        head = fold(f"{renames.prefix}{renames.basename}_")
+        tail = fold(f"{renames.suffix}.png")
+        
+        indices = []
+        for key in self.kept_names:
+            if len(key) <= len(head) + len(tail) or not key.startswith(head) or not key.endswith(tail):
+                continue
+            digits = key[len(head):len(key) - len(tail)]
+            try:
+                index = int(digits)
+            except ValueError:
+                continue
+            position = index - renames.start_index
+            # Exact formatting check rejects e.g. different padding or "+1"
+            if 0 <= position < len(renames) and str(index).zfill(renames.zero_padding) == digits:
+                indices.append(position)
+        
+        indices.sort()
+        return [f"Would overwrite existing file: {renames.target_name(i)}" for i in indices]
@@ -0,0 +1,146 @@
+"""
+Sort keys for PNG file names.
+"""
+
+import heapq
+import itertools
+import re
+from array import array
+
+_split_digits = re.compile(r'(\d+)').split
+
+# Keys of the text before the frame number, shared by every frame of a sequence
+_stem_keys = {}
+_STEM_CACHE_SIZE = 4096
+
+
+def _text_key(text):
+    """Natural sort key of already lowercased text."""
+    parts = _split_digits(text)
+    parts[1::2] = map(int, parts[1::2])
+    return tuple(parts)
+
+
+def natural_sort_key(text):
+    """Convert a string into a tuple of string and number chunks for natural sorting.
+
+    "Frame_0012.png" -> ('frame_', 12, '.png'). Names shaped <stem><digits>.png
+    skip the regex: the key of the stem is cached and the frame number is
+    appended, which gives exactly the key the regex would.
+    """
+    text = str(text).lower()
+    if text.endswith('.png'):
+        body = text[:-4]
+        stem = body.rstrip('0123456789')
+        # A stem ending in a non-ASCII digit would merge with the frame number
+        if len(stem) < len(body) and not stem[-1:].isdigit():
+            stem_key = _stem_keys.get(stem)
+            if stem_key is None:
+                if len(_stem_keys) >= _STEM_CACHE_SIZE:
+                    _stem_keys.clear()
+                stem_key = _stem_keys[stem] = _text_key(stem)
+            return stem_key + (int(body[len(stem):]), '.png')
+    return _text_key(text)
+
+
+def frame_pattern(name):
+    """Return (head, tail) around the last ASCII digit run of a lowercased name, or None."""
+    end = len(name)
+    while end and not '0' <= name[end - 1] <= '9':
+        end -= 1
+    body = name[:end]
+    head = body.rstrip('0123456789')
+    tail = name[end:]
+    # Other digits next to or after the frame number would change the key
+    if not end or head[-1:].isdigit() or any(c.isdigit() for c in tail):
+        return None
+    return head, tail
+
+
+class FrameIndex:
+    """Frame numbers of the names that follow one <head><digits><tail> pattern.
+
+    The pattern (compared lowercased) is the most common one among the first
+    SAMPLE names. For a matching name, natural_sort_key is _text_key(head) +
+    (frame, tail), the same head and tail for all of them, so they can be
+    ordered by frame number alone; frames are kept in an array('q'). Names
+    that do not match are ordered with natural_sort_key and merged in.
+    """
+    
+    SAMPLE = 64
+    MAX_FRAME = 2 ** 63 - 1
+    
+    def __init__(self, names):
+        self.names = names
+        self.head = None
+        self.tail = None
+        self.frames = array('q')
+        self.positions = array('q')  # index in names of each entry in frames
+        self.fallback = []  # indices of names that do not match
+        
+        counts = {}
+        for name in itertools.islice(names, self.SAMPLE):
+            pattern = frame_pattern(name.lower())
+            if pattern is not None:
+                counts[pattern] = counts.get(pattern, 0) + 1
+        if not counts:
+            self.fallback = list(range(len(names)))
+            return
+        head, tail = self.head, self.tail = max(counts, key=counts.get)
+        
+        # Usually every name has the same spelling; try that before lowercasing them all
+        first = names[0]
+        if len(first.lower()) == len(first) and frame_pattern(first.lower()) == (head, tail):
+            if self._index_all(names, first[:len(head)], first[len(first) - len(tail):]):
+                return
+        lowered = list(map(str.lower, names))
+        if self._index_all(lowered, head, tail):
+            return
+        cut = len(tail)
+        for i, name in enumerate(lowered):
+            if name.endswith(tail):
+                body = name[:len(name) - cut]
+                stem = body.rstrip('0123456789')
+                if stem == head and len(stem) < len(body):
+                    frame = int(body[len(stem):])
+                    if frame <= self.MAX_FRAME:
+                        self.frames.append(frame)
+                        self.positions.append(i)
+                        continue
+            self.fallback.append(i)
+    
+    def _index_all(self, lowered, head, tail):
+        """Fast path for a folder holding only the one sequence: bulk checks, no loop."""
+        if not (all(map(str.startswith, lowered, itertools.repeat(head)))
+                and all(map(str.endswith, lowered, itertools.repeat(tail)))):
+            return False
+        start, cut = len(head), len(tail)
+        digits = [name[start:len(name) - cut] for name in lowered]
+        joined = ''.join(digits)
+        # Every name needs a frame number made of ASCII digits only
+        if not (all(digits) and joined.isascii() and joined.isdigit()):
+            return False
+        try:
+            self.frames = array('q', map(int, digits))
+        except OverflowError:
+            return False
+        self.positions = array('q', range(len(lowered)))
+        return True
+    
+    def order(self):
+        """Return the indices of names in natural_sort_key order, stable like list.sort."""
+        frames = self.frames
+        positions = self.positions
+        by_frame = sorted(range(len(frames)), key=frames.__getitem__)
+        if not self.fallback:
+            return by_frame  # positions[j] == j when every name matched
+        
+        # Merge on (key, index) so equal keys keep input order
+        names = self.names
+        fallback = sorted((natural_sort_key(names[i]), i) for i in self.fallback)
+        if not frames:
+            return [i for _, i in fallback]
+        head_key = _text_key(self.head)
+        tail = self.tail
+        matched = ((head_key + (frames[j], tail), positions[j]) for j in by_frame)
+        return [i for _, i in heapq.merge(matched, fallback)]
@@ -0,0 +1,187 @@
+"""
+Streaming mode
+
+For folders too large to hold as several full lists, scanning, sorting,
+planning and renaming can be chained as generators. Only the sort needs every
+item; it sorts fixed-size chunks and spills them to temporary files, so peak
+memory depends on STREAM_CHUNK_SIZE rather than on the folder size.
+"""
+
+import heapq
+import itertools
+import os
+import pickle
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from .executor import DirRenamer, rollback_error
+from .instrument import count
+from .planner import format_target_name, resolve_padding
+from .scanner import entry_sort_key, iter_png_entries
+
+STREAM_CHUNK_SIZE = 100000
+
+
+def _spill_dumper(spill_file):
+    """Return a dump function for spill_file that keeps no pickle memo between records."""
+    pickler = pickle.Pickler(spill_file, pickle.HIGHEST_PROTOCOL)
+    pickler.fast = True  # no memo, so memory does not grow with the record count
+    return pickler.dump
+
+
+def _spill(records):
+    """Pickle records to an anonymous temporary file and return it rewound."""
+    spill_file = tempfile.TemporaryFile()
+    dump = _spill_dumper(spill_file)
+    for record in records:
+        dump(record)
+    spill_file.seek(0)
+    return spill_file
+
+
+def _unspill(spill_file, close=True):
+    """Yield the records written by _spill, closing the file when exhausted unless close is false."""
+    try:
+        load = pickle.Unpickler(spill_file).load
+        while True:
+            try:
+                yield load()
+            except EOFError:
+                return
+    finally:
+        if close:
+            spill_file.close()
+
+
+def external_sort(items, key=None, chunk_size=STREAM_CHUNK_SIZE):
+    """Sort an iterable with bounded memory and return (count, iterator).
+
+    Items are sorted chunk by chunk; if everything fits in one chunk it is sorted
+    in memory, otherwise each sorted run is spilled to disk and the runs are
+    merged lazily. The result is stable, exactly like list.sort. With key=None
+    the input order is kept and only spilled, which still yields the count up front.
+    """
+    runs = []
+    count = 0
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            count += len(chunk)
+            if key is not None:
+                chunk.sort(key=key)
+            runs.append(_spill(chunk))
+            chunk = []
+    count += len(chunk)
+    if key is not None:
+        chunk.sort(key=key)
+    
+    if not runs:
+        return count, iter(chunk)
+    
+    streams = [_unspill(run) for run in runs] + [iter(chunk)]
+    if key is None:
+        return count, itertools.chain.from_iterable(streams)
+    return count, heapq.merge(*streams, key=key)
+
+
+def iter_plan(png_files, total_files, basename, start_index, zero_padding, prefix, suffix):
+    """Generator version of plan_renames; total_files is needed to auto-detect padding."""
+    if not basename.strip():
+        raise ValueError("Basename is required")
+    
+    zero_padding = resolve_padding(zero_padding, start_index, total_files)
+    for i, old_path in enumerate(png_files, start_index):
+        yield old_path, format_target_name(basename, i, zero_padding, prefix, suffix)
+
+
+def stream_two_phase_rename(renames, folder_path):
+    """Two-phase rename that yields (old_path, new_path) as each file completes.
+
+    Unlike two_phase_rename this cannot see the whole plan up front, so every
+    file goes through a temporary name. The temporary-name mapping from phase 1
+    is spilled to disk instead of being kept in memory, so renames can be any
+    iterable of (old_path, new_name).
+
+    If a rename fails, or the generator is closed before it is exhausted (e.g.
+    the log writer consuming it failed), every file goes back to its original
+    name, including those already yielded. There is no journal: files that
+    cannot be restored are counted and named in the raised error.
+    """
+    folder = Path(folder_path)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    renamer = DirRenamer(folder)
+    spill_file = tempfile.TemporaryFile()
+    dump = _spill_dumper(spill_file)
+    moves = 0
+    finished = 0  # records of the spill file whose file has its final name
+    
+    try:
+        # Phase 1: Rename to temporary names, recording (temp, original, new)
+        for old_path, new_name in renames:
+            old_name = os.path.basename(old_path)
+            if old_name != new_name:  # Skip if already correctly named
+                temp_name = f"temp_{stamp}_{old_name}"
+                renamer.rename(old_name, temp_name)
+                moves += 1
+                dump((temp_name, old_name, new_name))
+        
+        # Phase 2: Rename from temporary to final names
+        spill_file.flush()
+        spill_file.seek(0)
+        for temp_name, old_name, new_name in _unspill(spill_file, close=False):
+            renamer.rename(temp_name, new_name)
+            moves += 1
+            finished += 1
+            yield folder / old_name, folder / new_name
+    
+    except BaseException as error:
+        # Finished files go back to their temporary names first, which frees
+        # every original name, then all temporary names go back
+        stranded = []
+        stuck = set()
+        spill_file.flush()
+        spill_file.seek(0)
+        records = _unspill(spill_file, close=False)
+        for i, (temp_name, old_name, new_name) in enumerate(itertools.islice(records, finished)):
+            try:
+                renamer.rename(new_name, temp_name)
+                moves += 1
+            except OSError:
+                stuck.add(i)
+                stranded.append((new_name, old_name))
+        spill_file.seek(0)
+        for i, (temp_name, old_name, _) in enumerate(_unspill(spill_file, close=False)):
+            if i in stuck:
+                continue
+            try:
+                renamer.rename(temp_name, old_name)
+                moves += 1
+            except OSError:
+                stranded.append((temp_name, old_name))
+        count('rollback.failures', len(stranded))
+        if isinstance(error, Exception):
+            count('rename.failures')
+            if stranded:
+                raise rollback_error(error, stranded) from error
+        raise
+    finally:
+        count('fs.rename', moves)
+        spill_file.close()
+        renamer.close()
+
+
+def stream_renames(folder_path, sort_mode, basename, start_index, zero_padding, prefix, suffix,
+                   chunk_size=STREAM_CHUNK_SIZE):
+    """Scan, sort, plan and rename a folder as one generator pipeline.
+
+    Yields (old_path, new_path) for each completed rename, ready to be passed
+    straight to write_log.
+    """
+    entries = iter_png_entries(folder_path, sort_mode in ("Modified", "Created"))
+    total_files, ordered = external_sort(entries, entry_sort_key(sort_mode), chunk_size)
+    count('scan.files', total_files)
+    names = (entry.name for entry in ordered)
+    plan = iter_plan(names, total_files, basename, start_index, zero_padding, prefix, suffix)
+    return stream_two_phase_rename(plan, folder_path)
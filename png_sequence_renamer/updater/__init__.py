@@ -0,0 +1,5 @@
+"""
+Update checker. Importing this package imports urllib and json.
+"""
+
+from .checker import DOWNLOAD_URL, UPDATE_CHECK_URL, UpdateChecker
@@ -0,0 +1,52 @@
+"""
+Update checking and downloading through the GitHub releases API.
+"""
+
+import json
+import os
+import tempfile
+import urllib.request
+
+from .. import __version__
+
+UPDATE_CHECK_URL = "https://api.github.com/repos/gouravbhagat20/png-sequence-renamer/releases/latest"
+DOWNLOAD_URL = "https://github.com/gouravbhagat20/png-sequence-renamer/releases/latest/download/"
+
+
+class UpdateChecker:
+    """Handle update checking and downloading."""
+    
+    @staticmethod
+    def check_for_updates():
+        """Check if a newer version is available."""
+        try:
+            with urllib.request.urlopen(UPDATE_CHECK_URL, timeout=5) as response:
+                data = json.loads(response.read().decode())
+                latest_version = data['tag_name'].lstrip('v')
+                download_url = data['assets'][0]['browser_download_url'] if data['assets'] else None
+                
+                return {
+                    'available': latest_version != __version__,
+                    'version': latest_version,
+                    'download_url': download_url,
+                    'release_notes': data.get('body', 'No release notes available.')
+                }
+        except Exception as e:
+            return {'available': False, 'error': str(e)}
+    
+    @staticmethod
+    def download_update(download_url, callback=None):
+        """Download the update file."""
+        try:
+            filename = download_url.split('/')[-1]
+            temp_file = os.path.join(tempfile.gettempdir(), filename)
+            
+            def progress_hook(block_num, block_size, total_size):
+                if callback and total_size > 0:
+                    percent = min(100, (block_num * block_size * 100) // total_size)
+                    callback(percent)
+            
+            urllib.request.urlretrieve(download_url, temp_file, progress_hook)
+            return temp_file
+        except Exception as e:
+            raise Exception(f"Download failed: {e}")
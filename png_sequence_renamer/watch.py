@@ -0,0 +1,301 @@
+"""
+Watch mode
+
+Renames frames into the sequence while a renderer is still writing them. The
+folder is scanned once at start-up; after that an incremental index (the names
+taken in the folder and the next sequence index) is kept up to date from
+filesystem events, so each new frame costs one rename and no listing.
+
+On Linux the events come from inotify, called through ctypes: a frame is taken
+when it is closed after writing or moved into the folder. Elsewhere, or when
+inotify is unavailable, the folder is polled instead and a new file is taken
+once its size and modification time are the same in two polls in a row.
+"""
+
+import os
+import re
+import select
+import struct
+import sys
+import time
+
+from .executor import DirRenamer
+from .instrument import count
+from .log import LogAppender
+from .planner import CASE_INSENSITIVE_FS, format_target_name
+from .scanner import scan_folder
+from .sorting import frame_pattern, natural_sort_key
+
+# Seconds between polls, and the longest wait for an inotify event
+POLL_INTERVAL = 1.0
+
+# From <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+# struct inotify_event header: wd, mask, cookie, len (then len bytes of name)
+_EVENT = struct.Struct('iIII')
+_READ_SIZE = 1 << 16
+
+
+def _is_png(name):
+    return len(name) > 4 and name[-4:].lower() == '.png'
+
+
+class InotifyWatcher:
+    """Events of one folder from Linux inotify. Raises OSError where that is unavailable."""
+    
+    def __init__(self, folder_path):
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on Linux")
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        mask = (IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE
+                | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+        if libc.inotify_add_watch(self.fd, os.fsencode(folder_path), mask) < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, os.strerror(err), os.fspath(folder_path))
+    
+    def poll(self, timeout):
+        """Wait up to timeout seconds and return the [(kind, name)] events since the last call.
+
+        kind is "added" (a file finished or moved in) or "removed". Returns
+        None if the kernel queue overflowed and events were lost. Raises
+        FileNotFoundError once the folder itself is deleted or moved.
+        """
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        events = []
+        lost = False
+        while True:
+            try:
+                data = os.read(self.fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    lost = True
+                elif mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    raise FileNotFoundError("Watched folder was deleted or moved")
+                elif mask & (IN_MOVED_FROM | IN_DELETE):
+                    events.append(("removed", name))
+                elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO) and not mask & IN_ISDIR:
+                    events.append(("added", name))
+        return None if lost else events
+    
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Portable stand-in for InotifyWatcher that compares folder listings.
+
+    Only new names are stat'ed; a file counts as added once its size and
+    modification time have not changed since the previous poll.
+    """
+    
+    def __init__(self, folder_path):
+        self.folder = os.fspath(folder_path)
+        self._known = set(os.listdir(self.folder))
+        self._pending = {}
+    
+    def poll(self, timeout):
+        """Sleep for timeout seconds and return the events since the last call, like InotifyWatcher."""
+        time.sleep(timeout)
+        events = []
+        pending = {}
+        with os.scandir(self.folder) as it:
+            names = set()
+            for entry in it:
+                name = entry.name
+                names.add(name)
+                if name in self._known:
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                signature = (stat.st_size, stat.st_mtime_ns)
+                if self._pending.get(name) == signature:
+                    self._known.add(name)
+                    events.append(("added", name))
+                else:
+                    pending[name] = signature
+        events.extend(("removed", name) for name in self._known - names)
+        self._known &= names
+        self._pending = pending
+        return events
+    
+    def close(self):
+        pass
+
+
+def open_watcher(folder_path, polling=False):
+    """Return an InotifyWatcher for folder, or a PollingWatcher if asked for or inotify fails."""
+    if not polling:
+        try:
+            return InotifyWatcher(folder_path)
+        except (OSError, AttributeError):
+            pass  # Not Linux, no inotify in libc, or out of watches
+    return PollingWatcher(folder_path)
+
+
+class WatchIndex:
+    """Incremental index of a watched folder that renames incoming frames into the sequence.
+
+    New PNG files get the next index of the plan_renames template, skipping
+    names that are taken. Files that already match the template (earlier
+    output) are left alone and only move the next index past their own.
+    With zero_padding 0 the padding follows earlier output, or else the frame
+    number of the first incoming file (render.0001.png -> 4).
+    """
+    
+    def __init__(self, folder_path, basename, start_index, zero_padding, prefix, suffix, log_path=None):
+        self.folder = os.path.abspath(folder_path)  # Logged paths must work from anywhere
+        self.basename = basename
+        self.prefix = prefix
+        self.suffix = suffix
+        self.next_index = start_index
+        self.zero_padding = zero_padding
+        self.fold = str.casefold if CASE_INSENSITIVE_FS else str
+        self.taken = set()
+        self.renamed = 0
+        self._output = re.compile(re.escape(f"{prefix}{basename}_") + r'(\d+)' + re.escape(f"{suffix}.png"),
+                                  re.IGNORECASE if CASE_INSENSITIVE_FS else 0)
+        self._renamer = DirRenamer(self.folder)
+        self._log = LogAppender(log_path) if log_path else None
+    
+    def _note_output(self, name):
+        """Account for name if it matches the template; return True if it does."""
+        match = self._output.fullmatch(name)
+        if match is None:
+            return False
+        digits = match.group(1)
+        self.next_index = max(self.next_index, int(digits) + 1)
+        if not self.zero_padding:
+            self.zero_padding = len(digits)
+        return True
+    
+    def load(self):
+        """Index the folder with one scan and return its incoming frames in name order."""
+        listing = set()
+        entries = scan_folder(self.folder, "Name", listing=listing)
+        self.taken.update(map(self.fold, listing))
+        return [entry.name for entry in entries if not self._note_output(entry.name)]
+    
+    def resync(self):
+        """Re-list the folder after lost events and return the incoming frames found."""
+        names = os.listdir(self.folder)
+        self.taken = set(map(self.fold, names))
+        incoming = [name for name in names if _is_png(name) and not self._note_output(name)]
+        incoming.sort(key=natural_sort_key)
+        return incoming
+    
+    def remove(self, name):
+        self.taken.discard(self.fold(name))
+    
+    def add(self, name):
+        """Rename a newly written file into the sequence; return its new name, or None if left alone."""
+        key = self.fold(name)
+        self.taken.add(key)
+        if not _is_png(name) or self._note_output(name):
+            return None
+        if not self.zero_padding:
+            pattern = frame_pattern(name.lower())
+            if pattern is not None:
+                self.zero_padding = len(name) - len(pattern[0]) - len(pattern[1])
+            else:
+                self.zero_padding = len(str(self.next_index))
+        
+        index = self.next_index
+        while True:
+            target = format_target_name(self.basename, index, self.zero_padding, self.prefix, self.suffix)
+            if self.fold(target) not in self.taken:
+                try:
+                    self._renamer.rename(name, target)
+                    count('fs.rename')
+                    break
+                except FileExistsError:
+                    count('rename.retries')
+                except FileNotFoundError:
+                    self.taken.discard(key)  # Already gone, e.g. renamed during load()
+                    return None
+            self.taken.add(self.fold(target))
+            index += 1
+        
+        self.next_index = index + 1
+        self.taken.discard(key)
+        self.taken.add(self.fold(target))
+        self.renamed += 1
+        if self._log is not None:
+            self._log.add(os.path.join(self.folder, name), os.path.join(self.folder, target))
+        return target
+    
+    def close(self):
+        self._renamer.close()
+        if self._log is not None:
+            self._log.close()
+
+
+def watch_folder(folder_path, basename, start_index, zero_padding, prefix, suffix, log_path=None,
+                 on_rename=None, stop=None, polling=False, interval=POLL_INTERVAL):
+    """Rename frames into the sequence as they arrive, until stop() returns True.
+
+    Frames already in the folder are renamed first. on_rename(old_name,
+    new_name) is called after every rename. Returns the WatchIndex (closed),
+    whose renamed attribute counts the renames.
+    """
+    if not basename.strip():
+        raise ValueError("Basename is required")
+    
+    # Watch before the scan so no frame slips in between
+    watcher = open_watcher(folder_path, polling)
+    index = WatchIndex(folder_path, basename, start_index, zero_padding, prefix, suffix, log_path)
+    
+    def take(names):
+        for name in names:
+            target = index.add(name)
+            if target is not None and on_rename is not None:
+                on_rename(name, target)
+    
+    try:
+        take(index.load())
+        while stop is None or not stop():
+            events = watcher.poll(interval)
+            if events is None:
+                take(index.resync())
+                continue
+            added = []
+            for kind, name in events:
+                if kind == "removed":
+                    index.remove(name)
+                else:
+                    added.append(name)
+            # Frames finished by parallel render threads may close slightly out of order
+            added.sort(key=natural_sort_key)
+            take(added)
+    finally:
+        watcher.close()
+        index.close()
+    return index